@@ -46,30 +46,62 @@ To implement this in your charm:
         self.catalogue = CatalogueProvider(
             charm=self,
             relation_name="catalogue",  # optional
+            coalesce=True,  # optional
         )
     ```
 
 
     The relevant events listeners are already registered by the CatalogueProvider object.
+
+    With `coalesce=True`, `items_changed` is only emitted when the aggregated set of items
+    differs from the one last emitted, e.g. a relation-changed following a relation-joined
+    with the same data, or a unit departing while its app stays, emit nothing.
+
+### Wire format
+
+The CatalogueProvider advertises the wire formats it reads in its app databag
+(`supported_formats`). When it reads the v2 format, the CatalogueConsumer sends its item
+as a single canonical JSON `payload`, along with a `payload_hash`, which lets the
+provider skip the relation-changed events that leave the item unchanged. Otherwise, the
+item is sent the v1 way, one databag key per field, which the provider still reads.
+
+The v2 payload also carries the `federation` of an item, if any, which the provider
+passes on as the `federation` key of the item.
 """
 
+import hashlib
 import ipaddress
 import json
 import logging
 from typing import Dict, Optional
 
-from ops.charm import CharmBase
-from ops.framework import EventBase, EventSource, Object, ObjectEvents
+from ops.charm import CharmBase, RelationChangedEvent
+from ops.framework import EventBase, EventSource, Object, ObjectEvents, StoredState
 
 LIBID = "fa28b361293b46668bcd1f209ada6983"
 LIBAPI = 1
-LIBPATCH = 3
+LIBPATCH = 10
 
 DEFAULT_RELATION_NAME = "catalogue"
 
+WIRE_FORMAT_VERSION = 2
+SUPPORTED_FORMATS_KEY = "supported_formats"
+PAYLOAD_KEY = "payload"
+PAYLOAD_HASH_KEY = "payload_hash"
+# The databag keys of the v1 wire format, one per item field.
+V1_KEYS = ("name", "description", "url", "icon", "api_docs", "api_endpoints")
+
 logger = logging.getLogger(__name__)
 
 
+def _canonical_json(data) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def _hash(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 class CatalogueItem:
     """`CatalogueItem` represents an application entry sent to a catalogue.
 
@@ -81,15 +113,19 @@ class CatalogueItem:
         - The value is the actual address of the endpoint (e.g., "'http://1.2.3.4:1234/api/v1/targets/metadata'").
         - Example for setting the api_endpoints attr:
             api_endpoints={"Alerts": f"{self.external_url}/api/v1/alerts"}
+    federation (dict): Items a catalogue forwards from its own catalogue relations, for the
+        catalogue it is related to to list them too. The content is up to the catalogues,
+        and is only sent with the v2 wire format.
     """
 
-    def __init__(self, name: str, url: str, icon: str, description: str = "", api_docs: str = "", api_endpoints: Optional[Dict[str,str]] = None):
+    def __init__(self, name: str, url: str, icon: str, description: str = "", api_docs: str = "", api_endpoints: Optional[Dict[str,str]] = None, federation: Optional[dict] = None):
         self.name = name
         self.url = url
         self.icon = icon
         self.description = description
         self.api_docs = api_docs
         self.api_endpoints = api_endpoints
+        self.federation = federation
 
 
 class CatalogueConsumer(Object):
@@ -116,25 +152,81 @@ class CatalogueConsumer(Object):
     def _on_relation_changed(self, _):
         self._update_relation_data()
 
-    def _update_relation_data(self):
+    def _update_relation_data(self) -> bool:
         if not self._charm.unit.is_leader():
-            return
+            return False
 
         if not self._item:
-            return
+            return False
 
+        changed = False
         for relation in self._charm.model.relations[self._relation_name]:
-            relation.data[self._charm.model.app]["name"] = self._item.name
-            relation.data[self._charm.model.app]["description"] = self._item.description
-            relation.data[self._charm.model.app]["url"] = self.unit_address(relation)
-            relation.data[self._charm.model.app]["icon"] = self._item.icon
-            relation.data[self._charm.model.app]["api_docs"] = self._item.api_docs
-            relation.data[self._charm.model.app]["api_endpoints"] = json.dumps(self._item.api_endpoints)
-
-    def update_item(self, item: CatalogueItem):
-        """Update the catalogue item."""
+            databag = relation.data[self._charm.model.app]
+            if self._reads_payload(relation):
+                payload = self._payload(relation)
+                # The v1 keys, if any, are deleted.
+                data = {PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: _hash(payload)}
+                data.update(dict.fromkeys(V1_KEYS, ""))
+            else:
+                data = {
+                    "name": self._item.name,
+                    "description": self._item.description,
+                    "url": self.unit_address(relation),
+                    "icon": self._item.icon,
+                    "api_docs": self._item.api_docs,
+                    "api_endpoints": json.dumps(self._item.api_endpoints),
+                    PAYLOAD_KEY: "",
+                    PAYLOAD_HASH_KEY: "",
+                }
+            changed = self._write_changed(databag, data) or changed
+        return changed
+
+    @staticmethod
+    def _write_changed(databag, data: Dict[str, str]) -> bool:
+        """Write the keys of `data` whose value differs from the databag's.
+
+        Every write is a relation-set the remote side may get a relation-changed event for,
+        so unchanged keys are left alone. An empty value deletes its key.
+        Return whether any key was written.
+        """
+        changed = {key: value for key, value in data.items() if databag.get(key, "") != value}
+        for key, value in changed.items():
+            if value:
+                databag[key] = value
+            else:
+                del databag[key]
+        return bool(changed)
+
+    @staticmethod
+    def _reads_payload(relation) -> bool:
+        """Check whether the remote catalogue reads the v2 wire format."""
+        if not relation.app:
+            return False
+        try:
+            formats = json.loads(relation.data[relation.app].get(SUPPORTED_FORMATS_KEY, "[]"))
+        except json.JSONDecodeError:
+            return False
+        return WIRE_FORMAT_VERSION in formats
+
+    def _payload(self, relation) -> str:
+        assert self._item
+        payload = {
+            "version": WIRE_FORMAT_VERSION,
+            "name": self._item.name,
+            "description": self._item.description,
+            "url": self.unit_address(relation),
+            "icon": self._item.icon,
+            "api_docs": self._item.api_docs,
+            "api_endpoints": self._item.api_endpoints or {},
+        }
+        if self._item.federation:
+            payload["federation"] = self._item.federation
+        return _canonical_json(payload)
+
+    def update_item(self, item: CatalogueItem) -> bool:
+        """Update the catalogue item, and return whether any relation data changed."""
         self._item = item
-        self._update_relation_data()
+        return self._update_relation_data()
 
     def unit_address(self, relation):
         """Return the unit address of the consumer, on which it is reachable.
@@ -189,35 +281,140 @@ class CatalogueProvider(Object):
     """`CatalogueProvider` is the side of the relation that serves the actual service catalogue."""
 
     on = CatalogueEvents()  # pyright: ignore
+    _stored = StoredState()
 
-    def __init__(self, charm: CharmBase, relation_name: str = DEFAULT_RELATION_NAME):
+    def __init__(
+        self,
+        charm: CharmBase,
+        relation_name: str = DEFAULT_RELATION_NAME,
+        coalesce: bool = False,
+    ):
         super().__init__(charm, relation_name)
         self._charm = charm
         self._relation_name = relation_name
+        self._coalesce = coalesce
+        # The payload hash last read from each relation, by relation id.
+        self._stored.set_default(items_digest="", payload_hashes={})
+        # Remote databags can't change during a dispatch, so the items are only computed
+        # once, and recomputed after relation events (the charm may outlive a single
+        # event, e.g. in Harness).
+        self._items = None
         events = self._charm.on[self._relation_name]
+        self.framework.observe(events.relation_created, self._on_relation_created)
         self.framework.observe(events.relation_changed, self._on_relation_changed)
         self.framework.observe(events.relation_joined, self._on_relation_changed)
         self.framework.observe(events.relation_departed, self._on_relation_changed)
         self.framework.observe(events.relation_broken, self._on_relation_broken)
+        # The relations that predate the v2 format, or a new leader, get it advertised too.
+        self.framework.observe(self._charm.on.leader_elected, self._on_advertise_all)
+        self.framework.observe(self._charm.on.upgrade_charm, self._on_advertise_all)
+
+    def _on_relation_created(self, event):
+        self._advertise_formats(event.relation)
+
+    def _on_advertise_all(self, _):
+        for relation in self._charm.model.relations[self._relation_name]:
+            self._advertise_formats(relation)
 
     def _on_relation_broken(self, event):
-        self.on.items_changed.emit(items=self.items)  # pyright: ignore
+        self._stored.payload_hashes.pop(str(event.relation.id), None)
+        self._items = None
+        self._emit_items_changed()
 
     def _on_relation_changed(self, event):
-        self.on.items_changed.emit(items=self.items)  # pyright: ignore
+        self._advertise_formats(event.relation)
+        payload_changed = self._update_payload_hash(event.relation)
+        if isinstance(event, RelationChangedEvent) and not payload_changed:
+            logger.debug("Catalogue payload of %s unchanged, skipping", event.relation.app)
+            return
+        self._items = None
+        self._emit_items_changed()
+
+    def _advertise_formats(self, relation):
+        if not self._charm.unit.is_leader():
+            return
+        formats = json.dumps([1, WIRE_FORMAT_VERSION])
+        if relation.data[self._charm.app].get(SUPPORTED_FORMATS_KEY) != formats:
+            relation.data[self._charm.app][SUPPORTED_FORMATS_KEY] = formats
+
+    def _update_payload_hash(self, relation) -> bool:
+        """Record the payload hash of a relation, and return whether it changed.
+
+        Relations without a payload hash, i.e. using the v1 wire format, always count as
+        changed.
+        """
+        if not relation.app:
+            return True
+        payload_hash = relation.data[relation.app].get(PAYLOAD_HASH_KEY)
+        if not payload_hash:
+            # Forget the hash of a payload the remote app stopped sending, e.g. after a
+            # downgrade, lest it matches the payload it sends again after an upgrade.
+            self._stored.payload_hashes.pop(str(relation.id), None)
+            return True
+        changed = payload_hash != self._stored.payload_hashes.get(str(relation.id))
+        self._stored.payload_hashes[str(relation.id)] = payload_hash
+        return changed
+
+    def _emit_items_changed(self):
+        items = self.items
+        if self._coalesce and not self.should_emit(items):
+            logger.debug("Catalogue items unchanged, skipping items_changed")
+            return
+        self._stored.items_digest = self.digest(items)
+        self.on.items_changed.emit(items=items)  # pyright: ignore
+
+    @staticmethod
+    def digest(items) -> str:
+        """Return a digest of a list of catalogue items, independent of key order."""
+        return hashlib.sha256(json.dumps(items, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def should_emit(self, items) -> bool:
+        """Check whether `items` differ from the items last emitted with `items_changed`."""
+        return self.digest(items) != self._stored.items_digest
 
     @property
     def items(self):
         """A list of apps sent over relation data."""
-        return [
-            {
-                "name": relation.data[relation.app].get("name", ""),
-                "url": relation.data[relation.app].get("url", ""),
-                "icon": relation.data[relation.app].get("icon", ""),
-                "description": relation.data[relation.app].get("description", ""),
-                "api_docs": relation.data[relation.app].get("api_docs", ""),
-                "api_endpoints": json.loads(relation.data[relation.app].get("api_endpoints", "{}")),
-            }
-            for relation in self._charm.model.relations[self._relation_name]
-            if relation.app and relation.units
-        ]
+        if self._items is None:
+            self._items = [
+                self._item_from_databag(dict(relation.data[relation.app]))
+                for relation in self._charm.model.relations[self._relation_name]
+                if relation.app and relation.units
+            ]
+        return self._items
+
+    @staticmethod
+    def _item_from_databag(data: Dict[str, str]) -> dict:
+        if PAYLOAD_KEY in data:
+            try:
+                payload = json.loads(data[PAYLOAD_KEY])
+            except json.JSONDecodeError:
+                payload = None
+            if not isinstance(payload, dict):
+                logger.warning("Ignoring malformed catalogue payload: %.100s", data[PAYLOAD_KEY])
+                payload = {}
+            if payload.get("version") == WIRE_FORMAT_VERSION:
+                item = {
+                    "name": payload.get("name", ""),
+                    "url": payload.get("url", ""),
+                    "icon": payload.get("icon", ""),
+                    "description": payload.get("description", ""),
+                    "api_docs": payload.get("api_docs", ""),
+                    "api_endpoints": payload.get("api_endpoints", {}),
+                }
+                if "federation" in payload:
+                    item["federation"] = payload["federation"]
+                return item
+            if payload:
+                logger.warning(
+                    "Unsupported catalogue payload version: %s", payload.get("version")
+                )
+
+        return {
+            "name": data.get("name", ""),
+            "url": data.get("url", ""),
+            "icon": data.get("icon", ""),
+            "description": data.get("description", ""),
+            "api_docs": data.get("api_docs", ""),
+            "api_endpoints": json.loads(data.get("api_endpoints", "{}")),
+        }
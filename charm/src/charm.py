@@ -6,11 +6,18 @@
 
 """Charmed operator for creating service catalogues on Kubernetes."""
 
+import cProfile
+import hashlib
 import json
 import logging
 import socket
+import tempfile
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional, cast
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, ParamSpec, Tuple, TypeVar, cast
 from urllib.parse import urlparse, urlunparse
 
 import ops_tracing
@@ -22,22 +29,63 @@ from charms.catalogue_k8s.v1.catalogue import (
 )
 from charms.istio_beacon_k8s.v0.service_mesh import ServiceMeshConsumer
 from charms.loki_k8s.v1.loki_push_api import LogForwarder
+from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
 from charms.tls_certificates_interface.v4.tls_certificates import (
     CertificateRequestAttributes,
     TLSCertificatesRequiresV4,
 )
 from charms.traefik_k8s.v2.ingress import IngressPerAppReadyEvent, IngressPerAppRequirer
+from opentelemetry import trace
 from ops.charm import ActionEvent, CharmBase
+from ops.framework import StoredState
 from ops.main import main
-from ops.model import ActiveStatus, BlockedStatus, WaitingStatus
-from ops.pebble import ChangeError, Error, Layer, PathError, ProtocolError
+from ops.model import ActiveStatus, BlockedStatus, Container, StatusBase, WaitingStatus
+from ops.pebble import (
+    APIError,
+    ChangeError,
+    CheckStatus,
+    Error,
+    Layer,
+    PathError,
+    ProtocolError,
+    ServiceDict,
+)
 
-from nginx_config import CA_CERT_PATH, CERT_PATH, KEY_PATH, NGINX_CONFIG_PATH, NginxConfigBuilder
+import federation
+from nginx_config import (
+    CA_CERT_PATH,
+    CERT_PATH,
+    CPU_MAX_PATH,
+    KEY_PATH,
+    NGINX_CONFIG_PATH,
+    STATUS_PORT,
+    NginxConfigBuilder,
+    worker_processes_for,
+)
+from prerender import render_index
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# The exporter turning nginx's stub_status into Prometheus metrics, as a Pebble service.
+EXPORTER_SERVICE = "nginx-prometheus-exporter"
+# Only images built with the exporter ship it.
+EXPORTER_PATH = "/usr/bin/nginx-prometheus-exporter"
+METRICS_PORT = 9113
+SCRAPE_JOBS = [{"static_configs": [{"targets": [f"*:{METRICS_PORT}"]}]}]
 
 ROOT_PATH = "/web"
 CONFIG_PATH = ROOT_PATH + "/config.json"
+INDEX_PATH = ROOT_PATH + "/index.html"
+# The client-rendered index.html, as built by the rock.
+INDEX_TEMPLATE_PATH = ROOT_PATH + "/index.template.html"
+
+# Where the reconcile profiles are dumped in the charm container, when `profiling` is set.
+PROFILES_DIR = Path(tempfile.gettempdir()) / "catalogue-k8s-profiles"
+MAX_PROFILES = 20
 
 
 @dataclass
@@ -49,15 +97,37 @@ class TLSConfig:
     private_key: str
 
 
+def _fingerprint(content: str) -> str:
+    """Return a content hash used to tell whether a pushed file needs updating."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 class CatalogueCharm(CharmBase):
     """Catalogue charm class."""
 
+    _stored = StoredState()
+
     def __init__(self, *args):
         super().__init__(*args)
         self.name = "catalogue"  # container, layer, service
-        self._fqdn = socket.getfqdn()
-
-        self.unit.set_ports(80)
+        # `fingerprints` holds the hashes of the files last pushed to the workload, by path.
+        # `cpu_max` caches the workload's cgroup CPU limit, and `fqdn` the pod's FQDN, both
+        # read once per container.
+        # `index_template` caches the UI's index.html template, read once per container too,
+        # and empty if the image has none.
+        # `exporter` tells whether the applied layer runs the exporter.
+        self._stored.set_default(
+            fingerprints={}, fqdn="", cpu_max="", index_template=None, exporter=False
+        )
+        # Pebble calls made and size of the files pushed to the workload during this hook,
+        # for tracing.
+        self._pebble_calls = 0
+        self._bytes_pushed = 0
+        # The items merged with those of federated catalogues, along with the provider's
+        # items they were merged from: they are only merged again once the provider
+        # recomputes its items, or the config changes (the charm may outlive a single event,
+        # e.g. in Harness).
+        self._items: Optional[Tuple[list, list]] = None
 
         self.charm_tracing = ops_tracing.Tracing(
             self,
@@ -65,7 +135,7 @@ class CatalogueCharm(CharmBase):
             ca_relation_name="receive-ca-cert",
         )
 
-        self._info = CatalogueProvider(charm=self)
+        self._info = CatalogueProvider(charm=self, coalesce=True)
 
         self._csr_attributes = CertificateRequestAttributes(
             # the `common_name` field is required but limited to 64 characters.
@@ -80,8 +150,6 @@ class CatalogueCharm(CharmBase):
             certificate_requests=[self._csr_attributes],
         )
 
-        desc = f"A service catalogue containing {len(self._info.items)} items."
-
         self._ingress = IngressPerAppRequirer(
             charm=self,
             port=self._internal_port,
@@ -90,25 +158,27 @@ class CatalogueCharm(CharmBase):
             scheme=lambda: urlparse(self._internal_url).scheme,
         )
 
-        self._catalogue_consumer = CatalogueConsumer(
-            charm=self,
-            relation_name="catalogue-item",
-            item=CatalogueItem(
-                name=f"{self.model.config['title']}",
-                icon="book-open-blank-variant-outline",
-                url=self._ingress.url or "about:blank",
-                description=desc,
-            ),
-        )
+        # The item is only built on catalogue-item events (see `_on_catalogue_item_changed`),
+        # as it requires going through all the catalogue relations.
+        self._catalogue_consumer = CatalogueConsumer(charm=self, relation_name="catalogue-item")
 
         self._mesh = ServiceMeshConsumer(self)
 
         self._log_forwarder = LogForwarder(self, relation_name="logging")
 
+        # The exporter is only advertised once it runs: on images without it, Prometheus
+        # would otherwise scrape a target that is down for good (see `_advertise_exporter`).
+        self._metrics_endpoint = (
+            MetricsEndpointProvider(self, jobs=SCRAPE_JOBS) if self._stored.exporter else None
+        )
+
         self.framework.observe(
             self.on.catalogue_pebble_ready,
             self._on_catalogue_pebble_ready,  # pyright: ignore
         )
+        # Pebble restarts nginx when it fails its liveness check: the charm only reports it.
+        self.framework.observe(self.on.catalogue_pebble_check_failed, self._on_pebble_check)
+        self.framework.observe(self.on.catalogue_pebble_check_recovered, self._on_pebble_check)
         self.framework.observe(
             self._info.on.items_changed,
             self._on_items_changed,  # pyright: ignore
@@ -125,6 +195,14 @@ class CatalogueCharm(CharmBase):
             self._on_certificate_available,
         )
         self.framework.observe(self.on.get_url_action, self._get_url)
+        for event in (
+            self.on["catalogue-item"].relation_created,
+            self.on["catalogue-item"].relation_joined,
+            self.on["catalogue-item"].relation_changed,
+            self.on["catalogue-item"].relation_departed,
+            self.on["catalogue-item"].relation_broken,
+        ):
+            self.framework.observe(event, self._on_catalogue_item_changed)
 
     def _get_url(self, event: ActionEvent):
         """Return the external hostname to be passed to ingress via the relation.
@@ -151,28 +229,59 @@ class CatalogueCharm(CharmBase):
         self._configure(self.items, push_certs=True)
 
     def _on_catalogue_pebble_ready(self, _):
+        # The container may have been recreated (pod churn), so what we last pushed to it
+        # can no longer be trusted.
+        self._stored.fingerprints.clear()
+        self._stored.cpu_max = ""
+        self._stored.fqdn = ""
+        self._stored.index_template = None
         # We set push_certs to True here to cover the upgrade sequence. When upgrade-charm fires,
         # the container may not yet be ready, and the certs are written to non-persistent storage
         # (which is a good thing).
         self._configure(self.items, push_certs=True)
 
+    def _on_pebble_check(self, _):
+        self._configure(self.items)
+
     def _update_status(self, status):
         if self.unit.is_leader():
             self.app.status = status
         self.unit.status = status
 
     def _on_upgrade(self, _):
+        self._stored.fingerprints.clear()
+        self._stored.cpu_max = ""
+        self._stored.fqdn = ""
+        self._stored.index_template = None
         # Ideally we would want to push certs on upgrade, but at this point we can't know for sure
         # if pebble-ready (can_connect guard).
         self._configure(self.items)
 
     def _on_config_changed(self, _):
+        self._items = None
         self._configure(self.items)
+        self._update_parent_catalogues()
+
+    def _on_items_changed(self, _: CatalogueItemsChangedEvent):
+        # The items of the event don't have the items of federated catalogues merged in.
+        self._configure(self.items)
+        self._update_parent_catalogues()
+
+    def _on_catalogue_item_changed(self, _):
+        self._catalogue_consumer.update_item(self._catalogue_item)
 
-    def _on_items_changed(self, event: CatalogueItemsChangedEvent):
-        self._configure(event.items)
+    def _update_parent_catalogues(self):
+        """Update the entry of this catalogue, and its federated items, in parent catalogues.
+
+        The consumer only writes what changed, so parents only hear about the changes of
+        the items they list.
+        """
+        if self.model.relations["catalogue-item"]:
+            self._catalogue_consumer.update_item(self._catalogue_item)
 
     def _on_certificate_available(self, _):
+        # Drop the TLS snapshot taken before the new certificate was stored.
+        self.__dict__.pop("_tls_config", None)
         self._configure(self.items, push_certs=True)
 
         # When server cert changes we need to update the scheme we inform traefik.
@@ -180,138 +289,366 @@ class CatalogueCharm(CharmBase):
         port = parsed.port or 80 if parsed.scheme == "http" else 443
         self._ingress.provide_ingress_requirements(scheme=parsed.scheme, port=port)
 
-    def _push_certs(self):
+    def _push_certs(self) -> bool:
+        """Push the TLS material to the workload, or remove it if TLS is not available.
+
+        Only the files whose content changed are pushed. Return whether the certificate
+        material on disk changed.
+        """
         if tls_config := self._tls_config:
-            self.workload.push(CERT_PATH, tls_config.server_cert, make_dirs=True)
-            self.workload.push(KEY_PATH, tls_config.private_key, make_dirs=True)
-            self.workload.push(CA_CERT_PATH, tls_config.ca_cert, make_dirs=True)
-        else:
-            for path in [KEY_PATH, CERT_PATH, CA_CERT_PATH]:
-                self.workload.remove_path(path, recursive=True)
+            changed = [
+                self._push_if_changed(CERT_PATH, tls_config.server_cert),
+                self._push_if_changed(KEY_PATH, tls_config.private_key),
+                self._push_if_changed(CA_CERT_PATH, tls_config.ca_cert),
+            ]
+            return any(changed)
+
+        # A removed file is fingerprinted as empty, which is also how a missing file reads.
+        absent = _fingerprint("")
+        changed = False
+        for path in [KEY_PATH, CERT_PATH, CA_CERT_PATH]:
+            cached = self._stored.fingerprints.get(path)
+            if cached == absent or (
+                cached is None and not self._pebble_call(self.workload.exists, path)
+            ):
+                self._stored.fingerprints[path] = absent
+                continue
+            self._pebble_call(self.workload.remove_path, path, recursive=True)
+            self._stored.fingerprints[path] = absent
+            changed = True
+        return changed
 
     def _configure(self, items, push_certs: bool = False):
-        if not self.workload.can_connect():
+        with self._phase("configure") as span, self._profiled():
+            span.set_attribute("catalogue.items", len(items))
+            self._reconcile(items, push_certs)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[trace.Span]:
+        """Trace a phase of the reconcile, with the Pebble calls and bytes pushed in it."""
+        pebble_calls, bytes_pushed = self._pebble_calls, self._bytes_pushed
+        with tracer.start_as_current_span(name) as span:
+            try:
+                yield span
+            finally:
+                span.set_attribute("catalogue.pebble_calls", self._pebble_calls - pebble_calls)
+                span.set_attribute("catalogue.bytes_pushed", self._bytes_pushed - bytes_pushed)
+
+    def _pebble_call(self, method: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call `method` of the workload, counting it as a call to the Pebble API."""
+        self._pebble_calls += 1
+        return method(*args, **kwargs)
+
+    @contextmanager
+    def _profiled(self) -> Iterator[None]:
+        """Profile the block with cProfile if the `profiling` config option is set.
+
+        Only the last `MAX_PROFILES` profiles are kept.
+        """
+        if not self.config.get("profiling"):
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+            path = PROFILES_DIR / f"configure-{time.time_ns()}.prof"
+            profiler.dump_stats(path)
+            for old in sorted(PROFILES_DIR.glob("configure-*.prof"))[:-MAX_PROFILES]:
+                old.unlink()
+            logger.info("Profile of the reconcile dumped to %s", path)
+
+    def _reconcile(self, items, push_certs: bool):
+        self.unit.set_ports(80)
+
+        if not self._pebble_call(self.workload.can_connect):
             self._update_status(WaitingStatus("Waiting for Pebble ready"))
             return
 
+        certs_changed = False
         if push_certs:
             try:
-                self._push_certs()
+                with self._phase("push certs") as span:
+                    certs_changed = self._push_certs()
+                    span.set_attribute("catalogue.changed", certs_changed)
             except (ProtocolError, PathError, Exception) as e:
                 self._update_status(BlockedStatus(str(e)))
                 logger.error(str(e))
                 return
 
         if override_hostname := self.config.get("override_hostname"):
-            for item in items:
-                item["url"] = self._override_hostname(item["url"], str(override_hostname))
+            # Build new entries rather than mutating the provider's (memoized) items.
+            items = [
+                {**item, "url": self._override_hostname(item["url"], str(override_hostname))}
+                for item in items
+            ]
 
-        nginx_config_changed = self._update_web_server_config()
-        catalogue_config_changed = self._update_catalogue_config(items)
-        pebble_layer_changed = self._update_pebble_layer()
-        restart = any([nginx_config_changed, catalogue_config_changed, pebble_layer_changed])
+        try:
+            with self._phase("update web server config") as span:
+                nginx_config_changed = self._update_web_server_config()
+                span.set_attribute("catalogue.changed", nginx_config_changed)
+        except ValueError as e:
+            msg = f"Invalid web server config: {e}"
+            self._update_status(BlockedStatus(msg))
+            logger.error(msg)
+            return
+        # config.json and index.html are served as static files, so a change to them alone
+        # needs no process action.
+        with self._phase("update catalogue config") as span:
+            catalogue_config_changed = self._update_catalogue_config(items)
+            span.set_attribute("catalogue.changed", catalogue_config_changed)
+        if catalogue_config_changed or INDEX_PATH not in self._stored.fingerprints:
+            with self._phase("update index") as span:
+                span.set_attribute("catalogue.changed", self._update_index(items))
+        try:
+            self._update_workload(nginx_config_changed or certs_changed)
+        except (ChangeError, APIError) as e:
+            msg = f"Failed to update Catalogue: {e}"
+            self._update_status(BlockedStatus(msg))
+            logger.error(msg)
+            return
 
-        if restart:
-            try:
-                self.workload.restart(self.name)
-            except ChangeError as e:
-                msg = f"Failed to restart Catalogue: {e}"
-                self._update_status(BlockedStatus(msg))
-                logger.error(msg)
-                return
+        with self._phase("check status"):
+            self._update_status(self._checks_status())
 
-        self._update_status(ActiveStatus())
+    def _update_workload(self, config_changed: bool):
+        """Apply the Pebble layer, then restart or reload the workload as needed.
 
-    def _update_pebble_layer(self) -> bool:
-        current_layer = self.workload.get_plan()
+        A changed layer restarts the services; otherwise nginx reloads any changed
+        config or certs.
+        """
+        with self._phase("update pebble layer") as span:
+            pebble_layer_changed = self._update_pebble_layer()
+            span.set_attribute("catalogue.changed", pebble_layer_changed)
+
+        configure_span = trace.get_current_span()
+        configure_span.set_attribute("catalogue.restarted", pebble_layer_changed)
+        configure_span.set_attribute(
+            "catalogue.reloaded", not pebble_layer_changed and config_changed
+        )
+        if pebble_layer_changed:
+            with self._phase("restart"):
+                self._pebble_call(self.workload.restart, self.name)
+        elif config_changed:
+            with self._phase("reload"):
+                self._reload_web_server()
+
+    def _checks_status(self) -> StatusBase:
+        """Return the status of the workload according to its Pebble checks.
+
+        Checks are only reported down once they fail `threshold` times in a row, so a
+        freshly (re)started nginx counts as up until proven otherwise.
+        """
+        failing = sorted(
+            name
+            for name, check in self._pebble_call(self.workload.get_checks).items()
+            if check.status != CheckStatus.UP
+        )
+        if failing:
+            return WaitingStatus(f"Failing checks: {', '.join(failing)}")
+        return ActiveStatus()
 
-        if current_layer.services == self._pebble_layer.services:
-            return False
+    def _reload_web_server(self):
+        """Gracefully reload nginx so that in-flight connections are not dropped.
 
-        self.workload.add_layer(self.name, self._pebble_layer, combine=True)
-        self.workload.autostart()
-        return True
+        On SIGHUP, nginx re-reads its config and replaces the workers once they are done
+        with their current requests. If the service is not running there is nothing to
+        reload, so it gets (re)started instead.
+        """
+        try:
+            self._pebble_call(self.workload.send_signal, "SIGHUP", self.name)
+            logger.info("Reloaded NGINX web server.")
+        except APIError as e:
+            logger.info("Could not reload NGINX (%s), restarting it instead.", e)
+            self._pebble_call(self.workload.restart, self.name)
+
+    def _update_pebble_layer(self) -> bool:
+        """Apply the charm's Pebble layer, and return whether its services changed.
+
+        Pebble picks up changed checks by itself: they need no service restart.
+        """
+        current_layer = self._pebble_call(self.workload.get_plan)
+        layer = self._pebble_layer
+        services_changed = current_layer.services != layer.services
+
+        if services_changed or current_layer.checks != layer.checks:
+            self._pebble_call(self.workload.add_layer, self.name, layer, combine=True)
+            if services_changed:
+                self._pebble_call(self.workload.autostart)
+        self._advertise_exporter(EXPORTER_SERVICE in layer.services)
+        return services_changed
+
+    def _advertise_exporter(self, running: bool):
+        """Advertise the scrape job of the exporter to Prometheus while it runs.
+
+        The job is published as soon as the exporter joins the layer, and withdrawn if it
+        leaves it, e.g. when the charm goes back to an image predating it.
+        """
+        if running == self._stored.exporter:
+            return
+        self._stored.exporter = running
+        if running:
+            self._metrics_endpoint = MetricsEndpointProvider(self, jobs=SCRAPE_JOBS)
+            self._metrics_endpoint.set_scrape_job_spec()
+        elif self.unit.is_leader():
+            for relation in self.model.relations["metrics-endpoint"]:
+                relation.data[self.app].pop("scrape_jobs", None)
 
     def _update_catalogue_config(self, items) -> bool:
-        config = {**self.charm_config, "apps": items}
+        config = json.dumps({**self.charm_config, "apps": items})
 
-        if self._running_catalogue_config == config:
+        if not self._push_if_changed(CONFIG_PATH, config):
             return False
 
-        self.workload.push(
-            CONFIG_PATH,
-            json.dumps({**self.charm_config, "apps": items}),
-            make_dirs=True,
-        )
         logger.info("Configuring %s application entries", len(items))
         return True
 
-    def _update_web_server_config(self) -> bool:
-        config = NginxConfigBuilder(self._tls_available).build()
+    def _update_index(self, items) -> bool:
+        """Pre-render the catalogue into index.html, for the UI to hydrate."""
+        template = self._index_template
+        if not template:
+            # The image predates pre-rendering, and the UI renders the page client-side.
+            return False
 
-        if self._running_nginx_config == config:
+        try:
+            index = render_index(template, {**self.charm_config, "apps": items})
+        except ValueError as e:
+            logger.error("Failed to render %s: %s", INDEX_PATH, e)
+            return False
+
+        return self._push_if_changed(INDEX_PATH, index)
+
+    @property
+    def _index_template(self) -> str:
+        """The UI's index.html template, or an empty string if the image has none.
+
+        The template only changes with the image, so it is pulled once per container and
+        then kept in stored state, rather than on every catalogue change.
+        """
+        if self._stored.index_template is None:
+            if self._pebble_call(self.workload.exists, INDEX_TEMPLATE_PATH):
+                self._stored.index_template = self._running_file(INDEX_TEMPLATE_PATH)
+            else:
+                self._stored.index_template = ""
+        return self._stored.index_template
+
+    def _update_web_server_config(self) -> bool:
+        config = NginxConfigBuilder(
+            tls=self._tls_available,
+            worker_processes=self._worker_processes,
+            worker_connections=cast(int, self.config["worker_connections"]),
+            access_log=str(self.config["access_log"]),
+            access_log_sample_rate=cast(float, self.config["access_log_sample_rate"]),
+        ).build()
+
+        if not self._push_if_changed(NGINX_CONFIG_PATH, config):
             return False
 
-        self.workload.push(NGINX_CONFIG_PATH, config, make_dirs=True)
         logger.info("Configuring NGINX web server.")
         return True
 
+    def _push_if_changed(self, path: str, content: str) -> bool:
+        """Push `content` to `path` in the workload, unless it is already there.
+
+        The fingerprint of the last pushed content is used to tell whether the file is
+        up to date. The file is only pulled back from the container when there is no
+        fingerprint to compare against, e.g. on the first hook after pod churn.
+        Return whether the file was pushed.
+        """
+        fingerprint = _fingerprint(content)
+        cached = self._stored.fingerprints.get(path)
+        if cached is None:
+            cached = _fingerprint(self._running_file(path))
+
+        if cached != fingerprint:
+            self._pebble_call(self.workload.push, path, content, make_dirs=True)
+            self._bytes_pushed += len(content.encode("utf-8"))
+
+        self._stored.fingerprints[path] = fingerprint
+        return cached != fingerprint
+
     def _override_hostname(self, url: str, override_hostname: str) -> str:
         """Change the base hostname to one set in the config options."""
         parsed_url = urlparse(url)
         modified_url = parsed_url._replace(netloc=override_hostname)
         return urlunparse(modified_url)
 
-    @property
-    def _running_nginx_config(self) -> str:
-        """Get the on-disk Nginx config."""
-        if not self.workload.can_connect():
-            return ""
-
+    def _running_file(self, path: str) -> str:
+        """Get the on-disk content of a workload file, or an empty string if unavailable."""
         try:
-            return str(self.workload.pull(NGINX_CONFIG_PATH, encoding="utf-8").read())
+            return str(self._pebble_call(self.workload.pull, path, encoding="utf-8").read())
         except (FileNotFoundError, Error) as e:
-            logger.error("Failed to retrieve Nginx config %s", e)
+            logger.error("Failed to retrieve %s: %s", path, e)
             return ""
 
-    @property
-    def _running_catalogue_config(self) -> dict:
-        """Get the on-disk Catalogue config."""
-        if not self.workload.can_connect():
-            return {}
-
-        try:
-            return json.loads(self.workload.pull(CONFIG_PATH, encoding="utf-8").read())
-        except (FileNotFoundError, Error) as e:
-            logger.error("Failed to retrieve Catalogue config %s", e)
-            return {}
+    @cached_property
+    def _exporter_available(self) -> bool:
+        """Whether the image ships the exporter, which images predating it do not."""
+        return self._pebble_call(self.workload.exists, EXPORTER_PATH)
 
     @property
     def _pebble_layer(self) -> Layer:
+        services: Dict[str, ServiceDict] = {
+            self.name: {
+                "override": "replace",
+                "summary": "catalogue",
+                "command": f"nginx -g 'daemon off;' -c {NGINX_CONFIG_PATH}",
+                "startup": "enabled",
+                "on-check-failure": {f"{self.name}-alive": "restart"},
+            },
+        }
+        if self._exporter_available:
+            services[EXPORTER_SERVICE] = {
+                "override": "replace",
+                "summary": "nginx prometheus exporter",
+                "command": f"{EXPORTER_PATH}"
+                f" --nginx.scrape-uri=http://127.0.0.1:{STATUS_PORT}/stub_status"
+                f" --web.listen-address=:{METRICS_PORT}",
+                "startup": "enabled",
+                "after": [self.name],
+            }
         return Layer(
             {
                 "summary": "catalogue layer",
                 "description": "pebble config layer for the catalogue",
-                "services": {
-                    self.name: {
+                "services": services,
+                "checks": {
+                    f"{self.name}-alive": {
                         "override": "replace",
-                        "summary": "catalogue",
-                        "command": f"nginx -g 'daemon off;' -c {NGINX_CONFIG_PATH}",
-                        "startup": "enabled",
-                    }
+                        "level": "alive",
+                        "period": "10s",
+                        "threshold": 3,
+                        "http": {"url": f"http://127.0.0.1:{STATUS_PORT}/healthz"},
+                    },
+                    # Serving over TLS makes an HTTP check fail certificate verification.
+                    f"{self.name}-ready": {
+                        "override": "replace",
+                        "level": "ready",
+                        "period": "10s",
+                        "threshold": 3,
+                        "tcp": {"port": self._internal_port},
+                    },
                 },
             }
         )
 
     @property
     def items(self):
-        """Applications to display in the catalogue."""
+        """Applications to display in the catalogue, including those of federated catalogues."""
         if not self._info:
             return []
-        return self._info.items
+        items = self._info.items
+        if self._items is None or self._items[0] is not items:
+            merged = federation.merge(self._catalogue_id, items, self._federation_max_depth)
+            self._items = (items, merged)
+        return self._items[1]
 
     @property
-    def workload(self):
+    def workload(self) -> Container:
         """The main workload of the charm."""
         return self.unit.get_container(self.name)
 
@@ -325,6 +662,67 @@ class CatalogueCharm(CharmBase):
             "links": json.loads(cast(str, self.model.config["links"])),
         }
 
+    @property
+    def _worker_processes(self) -> str:
+        """The number of nginx workers, with `auto` sized to the container's CPU limit.
+
+        nginx's own `auto` counts the CPUs of the node rather than the CPUs the container
+        is allowed to use, which spawns too many workers in a CPU-limited pod.
+        """
+        worker_processes = str(self.config["worker_processes"])
+        if worker_processes != "auto":
+            return worker_processes
+
+        if not self._stored.cpu_max:
+            try:
+                self._stored.cpu_max = (
+                    self._pebble_call(self.workload.pull, CPU_MAX_PATH).read().strip() or "max"
+                )
+            except (FileNotFoundError, Error) as e:
+                logger.debug("Failed to retrieve the workload CPU limit: %s", e)
+                self._stored.cpu_max = "max"
+
+        return str(worker_processes_for(self._stored.cpu_max) or "auto")
+
+    @property
+    def _fqdn(self) -> str:
+        """The pod's fully qualified domain name.
+
+        The name resolution can be slow, and the FQDN only changes with the pod, so it is
+        looked up once per container and then kept in stored state.
+        """
+        if not self._stored.fqdn:
+            self._stored.fqdn = socket.getfqdn()
+        return self._stored.fqdn
+
+    @property
+    def _catalogue_id(self) -> str:
+        """The identifier of this catalogue among federated catalogues, across models."""
+        return f"{self.model.uuid}:{self.app.name}"
+
+    @property
+    def _federation_max_depth(self) -> int:
+        return cast(int, self.config["federation_max_depth"])
+
+    @property
+    def _catalogue_item(self) -> CatalogueItem:
+        """The entry representing this catalogue in another catalogue.
+
+        When federating, it also carries the items of this catalogue, for the other
+        catalogue to list them too.
+        """
+        return CatalogueItem(
+            name=f"{self.model.config['title']}",
+            icon="book-open-blank-variant-outline",
+            url=self._ingress.url or "about:blank",
+            description=f"A service catalogue containing {len(self.items)} items.",
+            federation=federation.tree(
+                self._catalogue_id, self._info.items, self._federation_max_depth
+            )
+            if self.config["federate"]
+            else None,
+        )
+
     @property
     def _internal_url(self) -> str:
         """Return the fqdn dns-based in-cluster (private) address of the catalogue server."""
@@ -338,8 +736,14 @@ class CatalogueCharm(CharmBase):
         parsed_url = urlparse(self._internal_url)
         return int(parsed_url.port or 80)
 
-    @property
+    @cached_property
     def _tls_config(self) -> Optional[TLSConfig]:
+        """The TLS material assigned to this unit.
+
+        Getting it means scanning relation data and parsing certificates, so it is only
+        done once per dispatch and shared by every consumer in the charm, unless new
+        certificates become available (see `_on_certificate_available`).
+        """
         certificates, key = self._cert_requirer.get_assigned_certificate(
             certificate_request=self._csr_attributes
         )
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Federation of catalogues.
+
+A federating catalogue forwards its items to the catalogue it is related to through
+`catalogue-item`, which then lists them along with its own. The items travel as a tree
+of catalogues, attached to the entry of the federating catalogue:
+
+    {"id": "<model uuid>:<app>", "items": [...], "children": [<tree>, ...]}
+
+Items are compact: their empty fields are left out. Catalogues are identified across
+models, so that the trees can be pruned of cycles (a catalogue showing up below itself)
+and bounded in depth.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, Set
+
+logger = logging.getLogger(__name__)
+
+ITEM_DEFAULTS = {
+    "name": "",
+    "url": "",
+    "icon": "",
+    "description": "",
+    "api_docs": "",
+    "api_endpoints": {},
+}
+
+
+def _compact(item: dict) -> dict:
+    return {key: value for key, value in item.items() if value and key in ITEM_DEFAULTS}
+
+
+def _expand(item: dict) -> dict:
+    return {**ITEM_DEFAULTS, **item}
+
+
+def _deduplicate(items: Iterable[dict]) -> List[dict]:
+    unique: Dict[str, dict] = {}
+    for item in items:
+        unique.setdefault(json.dumps(item, sort_keys=True), item)
+    return list(unique.values())
+
+
+def _children(items: List[dict]) -> List[dict]:
+    """Return the trees forwarded by the federating catalogues among `items`."""
+    return [item["federation"] for item in items if isinstance(item.get("federation"), dict)]
+
+
+def _prune(trees: List[dict], ancestors: Set[str], depth: int) -> List[dict]:
+    """Drop the catalogues deeper than `depth`, or found below themselves."""
+    if depth <= 0:
+        return []
+
+    pruned = []
+    for tree in trees:
+        catalogue_id = tree.get("id", "")
+        if catalogue_id in ancestors:
+            logger.warning("Ignoring the items of %s, federated in a cycle", catalogue_id)
+            continue
+        pruned.append(
+            {
+                "id": catalogue_id,
+                "items": tree.get("items", []),
+                "children": _prune(
+                    tree.get("children", []), ancestors | {catalogue_id}, depth - 1
+                ),
+            }
+        )
+    return pruned
+
+
+def _walk(tree: dict) -> Iterator[dict]:
+    for item in tree["items"]:
+        yield _expand(item)
+    for child in tree["children"]:
+        yield from _walk(child)
+
+
+def tree(catalogue_id: str, items: List[dict], max_depth: int) -> dict:
+    """Build the tree a catalogue forwards upstream, from its items.
+
+    Federated catalogues more than `max_depth` levels below the catalogue are left out.
+    """
+    return {
+        "id": catalogue_id,
+        "items": _deduplicate(_compact(item) for item in items),
+        "children": _prune(_children(items), {catalogue_id}, max_depth - 1),
+    }
+
+
+def merge(catalogue_id: str, items: List[dict], max_depth: int) -> List[dict]:
+    """Merge the items forwarded by federated catalogues into the items of a catalogue.
+
+    Federated catalogues more than `max_depth` levels below the catalogue are left out,
+    and so are the forwarded items the catalogue already has.
+    """
+    if not any("federation" in item for item in items):
+        return items
+
+    own = [{key: value for key, value in item.items() if key != "federation"} for item in items]
+    known = {json.dumps(item, sort_keys=True) for item in own}
+    federated = _deduplicate(
+        item
+        for child in _prune(_children(items), {catalogue_id}, max_depth)
+        for item in _walk(child)
+    )
+    return own + [item for item in federated if json.dumps(item, sort_keys=True) not in known]
@@ -3,90 +3,244 @@
 # See LICENSE file for licensing details.
 """Config builder for Nginx."""
 
+import math
 import os
-from textwrap import dedent
+from textwrap import dedent, indent
+from typing import Optional, Union
 
 NGINX_CONFIG_PATH = "/etc/nginx/nginx.conf"
 CATALOGUE_CERTS_DIR = "/etc/catalogue/certs"
 CERT_PATH = os.path.join(CATALOGUE_CERTS_DIR, "catalogue.cert.pem")
 KEY_PATH = os.path.join(CATALOGUE_CERTS_DIR, "catalogue.key.pem")
 CA_CERT_PATH = os.path.join(CATALOGUE_CERTS_DIR, "ca.cert")
+CPU_MAX_PATH = "/sys/fs/cgroup/cpu.max"
+# The port of the server answering health checks and exposing nginx's status, only
+# reachable from within the pod.
+STATUS_PORT = 8081
+
+HTTP_SERVER = """
+listen               80;
+server_name          localhost;
+keepalive_timeout    65;
+root                 /web;
+"""
+
+HTTPS_SERVER = f"""
+listen               443 ssl;
+server_name          localhost;
+keepalive_timeout    70;
+root                 /web;
+ssl_certificate      {CERT_PATH};
+ssl_certificate_key  {KEY_PATH};
+ssl_protocols        TLSv1 TLSv1.1 TLSv1.2 TLSv1.3;
+ssl_ciphers          HIGH:!aNULL:!MD5;
+"""
+
+LOCATIONS = """
+etag                 on;
+
+# Vite content-hashes the file names of the bundle, so their content never changes.
+location /assets/ {
+    add_header       Cache-Control "public, max-age=31536000, immutable";
+}
+
+# The bundled MDI icons, named after the icon they draw, only change with the rock.
+location /icons/ {
+    add_header       Cache-Control "public, max-age=86400";
+}
+
+# The entry point, the catalogue config and the service worker change under the same name:
+# browsers must revalidate them (using their ETag) before every use.
+# The charm rewrites the first two while nginx runs, so they are kept out of the open file
+# cache, which would serve their previous ETag until it revalidates them.
+location = /index.html {
+    add_header       Cache-Control "no-cache";
+    open_file_cache  off;
+}
+location = /config.json {
+    add_header       Cache-Control "no-cache";
+    open_file_cache  off;
+}
+location = /sw.js {
+    add_header       Cache-Control "no-cache";
+}
 
-HTTP_SERVICE = """
-http {
-    include            mime.types;
-    default_type       application/octet-stream;
-    sendfile           on;
-    keepalive_timeout  65;
-    access_log         /dev/stdout;
-    error_log          /dev/stderr;
-
-    upstream self {
-      server localhost:80;
-    }
-
-    server {
-        listen               80;
-        server_name          localhost;
-        root                 /web;
-
-        error_page           500 502 503 504  /50x.html;
-        location = /50x.html {
-            root             /usr/share/nginx/html;
-        }
-    }
+error_page           500 502 503 504  /50x.html;
+location = /50x.html {
+    root             /usr/share/nginx/html;
 }
 """
 
-HTTPS_SERVICE = f"""
-http {{
-    include             mime.types;
-    default_type        application/octet-stream;
-    sendfile            on;
-    ssl_session_cache   shared:SSL:10m;
-    ssl_session_timeout 10m;
-    access_log          /dev/stdout;
-    error_log           /dev/stderr;
-
-    server {{
-        listen               443 ssl;
-        server_name          localhost;
-        keepalive_timeout    70;
-        root                 /web;
-        ssl_certificate      {CERT_PATH};
-        ssl_certificate_key  {KEY_PATH};
-        ssl_protocols        TLSv1 TLSv1.1 TLSv1.2 TLSv1.3;
-        ssl_ciphers          HIGH:!aNULL:!MD5;
-
-        error_page           500 502 503 504  /50x.html;
-        location = /50x.html {{
-            root             /usr/share/nginx/html;
-        }}
-    }}
+STATUS_SERVER = f"""
+listen               127.0.0.1:{STATUS_PORT};
+access_log           off;
+
+# Answered without touching the disk, for health checks to be cheap.
+location = /healthz {{
+    return           204;
+}}
+
+# Connection and request counters, which the exporter turns into Prometheus metrics.
+location = /stub_status {{
+    stub_status;
 }}
 """
 
+# One JSON object per request, with its timings, for the logs shipped to Loki to support
+# latency analysis. The upstream fields stay empty as long as nginx serves static files.
+LOG_FORMAT = (
+    "log_format  json  escape=json '{"
+    '"time":"$time_iso8601",'
+    '"remote_addr":"$remote_addr",'
+    '"request":"$request",'
+    '"status":$status,'
+    '"bytes_sent":$bytes_sent,'
+    '"request_time":$request_time,'
+    '"upstream_response_time":"$upstream_response_time",'
+    '"upstream_cache_status":"$upstream_cache_status",'
+    '"ssl_session_reused":"$ssl_session_reused",'
+    '"http_user_agent":"$http_user_agent"'
+    "}';\n"
+)
+ACCESS_LOG_MODES = ("full", "sampled", "off")
+
+
+def worker_processes_for(cpu_max: str) -> Optional[int]:
+    """Return the number of workers matching a cgroup v2 `cpu.max` limit, if there is one.
+
+    `cpu.max` reads `<quota> <period>`, where the quota is `max` for unlimited CPU.
+    """
+    quota, _, period = cpu_max.strip().partition(" ")
+    if not quota.isdigit() or not period.isdigit() or int(period) == 0:
+        return None
+    return max(1, math.ceil(int(quota) / int(period)))
+
 
 class NginxConfigBuilder:
-    """Class."""
+    """Builder for the nginx config serving the catalogue.
+
+    The defaults are tuned for throughput: one worker per available CPU, many connections
+    per worker, cached file descriptors for the static files in `/web` and
+    sendfile/TCP options that cut down on packets and syscalls.
+
+    The rock ships gzipped siblings of the bundled assets, which are served as they are
+    (`gzip_static`); `config.json`, rewritten by the charm, is compressed on the fly.
+
+    Requests are logged as JSON, either all of them (`full`), a share of them
+    (`sampled`, at `access_log_sample_rate` percent) or none (`off`).
+    """
+
+    def __init__(
+        self,
+        tls: bool = False,
+        worker_processes: Union[int, str] = "auto",
+        worker_connections: int = 4096,
+        access_log: str = "full",
+        access_log_sample_rate: float = 10.0,
+    ):
+        if worker_processes != "auto" and not (
+            str(worker_processes).isdigit() and int(worker_processes) > 0
+        ):
+            raise ValueError(f"worker_processes must be 'auto' or a positive integer, got {worker_processes!r}")
+        if worker_connections < 1:
+            raise ValueError(f"worker_connections must be positive, got {worker_connections}")
+        if access_log not in ACCESS_LOG_MODES:
+            raise ValueError(
+                f"access_log must be one of {', '.join(ACCESS_LOG_MODES)}, got {access_log!r}"
+            )
+        if access_log == "sampled" and not 0 < access_log_sample_rate <= 100:
+            raise ValueError(
+                f"access_log_sample_rate must be a percentage above 0, got {access_log_sample_rate}"
+            )
+        # split_clients takes percentages with at most two decimals.
+        if access_log == "sampled" and round(access_log_sample_rate, 2) != access_log_sample_rate:
+            raise ValueError(
+                "access_log_sample_rate must have at most two decimals, "
+                f"got {access_log_sample_rate}"
+            )
 
-    def __init__(self, tls: bool = False):
         self._tls = tls
+        self._worker_processes = worker_processes
+        self._worker_connections = worker_connections
+        self._access_log = access_log
+        self._access_log_sample_rate = access_log_sample_rate
 
-    def _nginx_config(self, service: str) -> str:
+    def _main(self) -> str:
+        # Each connection needs a descriptor for the client and one for the file it's served.
         return dedent(
-            f"""worker_processes  1;
-        events {{
-            worker_connections  1024;
-        }}
+            f"""\
+            worker_processes      {self._worker_processes};
+            worker_rlimit_nofile  {self._worker_connections * 2};
+            """
+        )
 
-        {service}
-        """
+    def _events(self) -> str:
+        return dedent(
+            f"""\
+            events {{
+                worker_connections  {self._worker_connections};
+                multi_accept        on;
+            }}
+            """
         )
 
-    def build(self):
-        """Build Nginx config file."""
+    def _http(self) -> str:
+        directives = dedent(
+            """\
+            include                   mime.types;
+            default_type              application/octet-stream;
+            sendfile                  on;
+            tcp_nopush                on;
+            tcp_nodelay               on;
+            keepalive_requests        1000;
+            open_file_cache           max=1000 inactive=60s;
+            open_file_cache_valid     10s;
+            open_file_cache_min_uses  1;
+            open_file_cache_errors    on;
+            gzip_static               on;
+            gzip                      on;
+            gzip_vary                 on;
+            gzip_proxied              any;
+            gzip_comp_level           5;
+            gzip_min_length           1024;
+            gzip_types                application/json;
+            error_log                 /dev/stderr;
+            """
+        )
+        directives += self._access_log_directives()
         if self._tls:
-            return self._nginx_config(HTTPS_SERVICE)
+            directives += dedent(
+                """\
+                ssl_session_cache         shared:SSL:10m;
+                ssl_session_timeout       10m;
+                """
+            )
+        servers = self._server() + self._status_server()
+        return "http {\n" + indent(directives + servers, "    ") + "}\n"
+
+    def _access_log_directives(self) -> str:
+        if self._access_log == "off":
+            return "access_log                off;\n"
+        if self._access_log == "full":
+            return LOG_FORMAT + "access_log                /dev/stdout json;\n"
+        # Requests are picked by the hash of their random id, so the sample is uniform.
+        return LOG_FORMAT + dedent(
+            f"""\
+            split_clients $request_id $access_log_sampled {{
+                {self._access_log_sample_rate:g}%  1;
+                *  0;
+            }}
+            access_log                /dev/stdout json if=$access_log_sampled;
+            """
+        )
 
-        return self._nginx_config(HTTP_SERVICE)
+    def _server(self) -> str:
+        server = HTTPS_SERVER if self._tls else HTTP_SERVER
+        return "\nserver {" + indent(server + LOCATIONS, "    ") + "}\n"
+
+    def _status_server(self) -> str:
+        return "\nserver {" + indent(STATUS_SERVER, "    ") + "}\n"
+
+    def build(self) -> str:
+        """Build Nginx config file."""
+        return "\n".join([self._main(), self._events(), self._http()])
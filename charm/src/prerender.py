@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Static rendering of the catalogue UI.
+
+The charm renders the catalogue into `index.html` whenever its config changes, so the
+page shows up with a single request, and also works with JavaScript disabled. The
+markup mirrors the UI's Preact components, which hydrate it from the inlined config.
+"""
+
+import json
+import re
+from html import escape
+from typing import List
+
+ROOT_ELEMENT = '<div id="root"></div>'
+ICON_STYLE = "margin-right: 8px; font-size: 1rem;"
+# The names of the icons bundled with the UI, which `MdiIcon` also checks.
+ICON_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+def _navigation(title: str) -> str:
+    return (
+        '<header id="navigation" class="p-navigation is-dark">'
+        '<div class="p-navigation__row"><div class="p-navigation__banner">'
+        '<div class="p-navigation__tagged-logo"><a class="p-navigation__link" href="#">'
+        '<div class="p-navigation__logo-tag"><img class="p-navigation__logo-icon" '
+        'src="https://assets.ubuntu.com/v1/82818827-CoF_white.svg" alt=""></div>'
+        f'<span class="p-navigation__logo-title" id="nav">{escape(title)}</span>'
+        "</a></div></div></div></header>"
+    )
+
+
+def _hero_strip(tagline: str, description: str) -> str:
+    content = (f"<h1>{escape(tagline)}</h1>" if tagline else "") + (
+        f"<p>{escape(description)}</p>" if description else ""
+    )
+    return f'<div class="p-strip--suru"><div class="row"><div class="col-12">{content}</div></div></div>'
+
+
+def _icon(icon: str, classes: str, style: str = "") -> str:
+    """Render an icon bundled with the UI, as the `MdiIcon` component does.
+
+    The icon is an image until the UI hydrates the page and inlines its SVG.
+    """
+    style_attr = f' style="{style}"' if style else ""
+    image = f'<img src="icons/mdi/{icon}.svg" alt="">' if ICON_NAME.match(icon) else ""
+    return f'<span class="{classes}"{style_attr} aria-hidden="true">{image}</span>'
+
+
+def _link_button(url: str, icon: str, tooltip: str) -> str:
+    content = (
+        _icon(icon, "iconify custom-icon")
+        + f'<span class="p-tooltip__message" role="tooltip">{tooltip}</span>'
+    )
+    if not url:
+        return f'<button class="p-tooltip--btm-center openLinkBtn customBtn" disabled>{content}</button>'
+    return (
+        f'<a class="p-button p-tooltip--btm-center openLinkBtn customBtn" href="{escape(url)}" '
+        f'target="_blank" rel="noopener noreferrer">{content}</a>'
+    )
+
+
+def _app_card(app: dict) -> str:
+    endpoints_button = (
+        '<button class="p-tooltip--btm-center customBtn"'
+        + ("" if app.get("api_endpoints") else " disabled")
+        + ">"
+        + _icon("api", "iconify custom-icon")
+        + '<span class="p-tooltip__message" role="tooltip">View endpoints</span></button>'
+    )
+    description = app.get("description", "")
+    return (
+        '<li class="p-matrix__item"><div class="p-matrix__content">'
+        '<h3 class="p-matrix__title">'
+        + _icon(app.get("icon", ""), "iconify icon md-48", ICON_STYLE)
+        + f"{escape(app.get('name', ''))}</h3>"
+        '<div style="display: flex;">'
+        + _link_button(app.get("url", ""), "web", "Visit UI")
+        + endpoints_button
+        + _link_button(app.get("api_docs", ""), "file-document", "Read docs")
+        + "</div>"
+        + (f'<p class="p-matrix__desc">{escape(description)}</p>' if description else "")
+        + "</div></li>"
+    )
+
+
+def _app_matrix(apps: List[dict]) -> str:
+    if not apps:
+        content = (
+            '<div class="p-notification--caution"><div class="p-notification__content">'
+            '<h5 class="p-notification__title">No items to display</h5>'
+            '<p class="p-notification__message">No applications available for display yet. '
+            "Add some by relating compatible charms to this one.</p></div></div>"
+        )
+    else:
+        content = (
+            '<input type="search" class="app-search" aria-label="Search applications" '
+            'placeholder="Search applications" autocomplete="off" value="">'
+            '<ul class="p-matrix" id="apps">' + "".join(_app_card(app) for app in apps) + "</ul>"
+        )
+    return f'<div class="row"><div class="col-12">{content}</div></div>'
+
+
+def _links_section(links: List[dict]) -> str:
+    if not links:
+        return ""
+
+    categories = []
+    for link in links:
+        if not link.get("category"):
+            continue
+        items = "".join(
+            f'<li><a href="{escape(item.get("url", ""))}"'
+            + (f' target="{escape(item["target"])}"' if item.get("target") else "")
+            + f">{escape(item.get('name', ''))}</a></li>"
+            for item in link.get("items", [])
+        )
+        categories.append(
+            '<li class="p-matrix__item"><div class="p-matrix__content">'
+            '<h3 class="p-matrix__title">'
+            + _icon("bookmark", "iconify icon md-48", ICON_STYLE)
+            + f'{escape(link["category"])}</h3><ul class="link-list">{items}</ul></div></li>'
+        )
+    return (
+        '<div class="row"><div class="col-12"><h3>Links</h3></div></div>'
+        '<div class="row"><div class="col-12"><ul class="p-matrix" id="links">'
+        + "".join(categories)
+        + "</ul></div></div>"
+    )
+
+
+def render_app(config: dict) -> str:
+    """Render the markup of the catalogue UI for a catalogue config."""
+    return (
+        _navigation(config.get("title", ""))
+        + _hero_strip(config.get("tagline", ""), config.get("description", ""))
+        + '<div class="p-strip"><div class="row"><div class="col-12"><h3>Applications</h3>'
+        "</div></div>"
+        + _app_matrix(config.get("apps", []))
+        + _links_section(config.get("links", []))
+        + "</div>"
+    )
+
+
+def render_index(template: str, config: dict) -> str:
+    """Render `index.html` from the UI's template, with the catalogue and its config inlined.
+
+    Raises:
+        ValueError: if the template has no empty root element to render into.
+
+    """
+    if ROOT_ELEMENT not in template:
+        raise ValueError("the index template has no empty root element")
+
+    # Escaping "<" keeps the config from closing the script element early.
+    inline_config = json.dumps(config).replace("<", "\\u003c")
+    root = (
+        f'<div id="root">{render_app(config)}</div>'
+        f'<script id="catalogue-config" type="application/json">{inline_config}</script>'
+    )
+    title = f"<title>{escape(config.get('title', ''))}</title>"
+    return template.replace(ROOT_ELEMENT, root, 1).replace("</head>", f"{title}</head>", 1)
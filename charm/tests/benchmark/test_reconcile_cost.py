@@ -0,0 +1,311 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Reconcile benchmark: cost of the events reconciling the catalogue as it grows.
+
+Every event is measured with 1, 10, 100 and 1000 related apps, for its wall time (best
+of `ROUNDS`), the Pebble calls it makes, the bytes it pushes to the workload and its
+peak memory. The measures are compared with `baseline.json`:
+
+- the Pebble calls and bytes pushed, which are deterministic, must not grow, but for the
+  bytes of TLS material, whose size varies by a few bytes with the key and certificate
+  generated for the session, which may grow by `TLS_BYTES_TOLERANCE`;
+- the wall time and peak memory, which depend on the machine and interpreter running the
+  benchmark, are only reported, as a ratio to the baseline.
+
+Run with `tox -e benchmark`; the measures are printed as a table. To record a new
+baseline, after a change that is expected to affect them, run with
+`UPDATE_BENCHMARK_BASELINE=1`.
+"""
+
+import dataclasses
+import gc
+import json
+import logging
+import os
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+from unittest.mock import patch
+
+import pytest
+from charms.tls_certificates_interface.v4.tls_certificates import (
+    LIBID,
+    Certificate,
+    CertificateRequestAttributes,
+    PrivateKey,
+    TLSCertificatesRequiresV4,
+)
+from ops.log import JujuLogHandler
+from ops.model import Container as OpsContainer
+from ops.testing import Container, Context, Relation, Secret, State
+
+from charm import CatalogueCharm
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+FQDN = "catalogue-k8s-0.catalogue-k8s-endpoints.test.svc.cluster.local"
+RELATION_COUNTS = (1, 10, 100, 1000)
+ROUNDS = 3
+# The events pushing TLS material, and the bytes it may grow by from one key to another.
+TLS_EVENTS = ("certificate-available",)
+TLS_BYTES_TOLERANCE = 64
+UPDATE_BASELINE = bool(os.environ.get("UPDATE_BENCHMARK_BASELINE"))
+
+
+@dataclasses.dataclass
+class Measure:
+    """The cost of handling an event."""
+
+    time_ms: float
+    pebble_calls: int
+    bytes_pushed: int
+    peak_memory_kib: float
+
+
+@dataclasses.dataclass(frozen=True)
+class TLSMaterial:
+    """A certificate issued for the unit's private key."""
+
+    private_key: PrivateKey
+    # The arguments of the `certificate-available` event.
+    certificate: dict
+
+
+def _relations(relation_count: int) -> list:
+    return [
+        Relation(
+            endpoint="catalogue",
+            remote_app_name=f"app-{i}",
+            remote_app_data={"name": f"app-{i}", "url": f"http://app-{i}", "icon": "rainbow"},
+        )
+        for i in range(relation_count)
+    ]
+
+
+def _fresh_state(relation_count: int) -> State:
+    """Return the state of a catalogue whose workload container was just created."""
+    return State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=_relations(relation_count),
+    )
+
+
+def _settled_state(context: Context, relation_count: int) -> State:
+    """Return the state of a running catalogue, which reconciled all its items."""
+    state = _fresh_state(relation_count)
+    return context.run(context.on.pebble_ready(state.get_container("catalogue")), state)
+
+
+@pytest.fixture(scope="session")
+def tls():
+    """Return a certificate issued for a key of the unit, generated once for the session."""
+    ca_key = PrivateKey.generate()
+    ca = Certificate.generate_self_signed_ca(
+        CertificateRequestAttributes(common_name="ca"), ca_key, timedelta(days=1)
+    )
+    key = PrivateKey.generate()
+    # The request the charm makes for its unit.
+    csr = CertificateRequestAttributes(
+        common_name="catalogue-k8s", sans_dns=frozenset((FQDN,))
+    ).generate_csr(private_key=key)
+    certificate = Certificate.generate(csr, ca, ca_key, timedelta(days=1))
+    return TLSMaterial(
+        private_key=key,
+        certificate={
+            "certificate": certificate,
+            "certificate_signing_request": csr,
+            "ca": ca,
+            "chain": [certificate, ca],
+        },
+    )
+
+
+def _tls_material(tls: TLSMaterial) -> Tuple[Relation, Secret]:
+    """Return the `certificates` relation and private key secret holding `tls`.
+
+    They hold what the TLS library and its provider store, for the charm to read its
+    TLS config from them.
+    """
+    certificate = tls.certificate
+    csr = str(certificate["certificate_signing_request"])
+    relation = Relation(
+        endpoint="certificates",
+        local_unit_data={
+            "certificate_signing_requests": json.dumps(
+                [{"certificate_signing_request": csr, "ca": False}]
+            )
+        },
+        remote_app_data={
+            "certificates": json.dumps(
+                [
+                    {
+                        "certificate_signing_request": csr,
+                        "certificate": str(certificate["certificate"]),
+                        "ca": str(certificate["ca"]),
+                        "chain": [str(cert) for cert in certificate["chain"]],
+                    }
+                ]
+            )
+        },
+    )
+    secret = Secret(
+        tracked_content={"private-key": str(tls.private_key)},
+        label=f"{LIBID}-private-key-0-certificates",
+        owner="unit",
+    )
+    return relation, secret
+
+
+# Build the event to measure and the state it is dispatched on, for a number of apps.
+Scenario = Callable[[Context, int, TLSMaterial], Tuple[object, State]]
+
+
+def _relation_changed(context: Context, relation_count: int, _tls: TLSMaterial):
+    # One of the apps changes its entry.
+    state = _settled_state(context, relation_count)
+    relation, *others = sorted(state.relations, key=lambda relation: relation.id)
+    assert isinstance(relation, Relation)
+    relation = dataclasses.replace(
+        relation, remote_app_data={**relation.remote_app_data, "url": "http://app-0/v2"}
+    )
+    state = dataclasses.replace(state, relations=[relation, *others])
+    return context.on.relation_changed(relation), state
+
+
+def _config_changed(context: Context, relation_count: int, _tls: TLSMaterial):
+    state = _settled_state(context, relation_count)
+    return context.on.config_changed(), dataclasses.replace(state, config={"title": "New"})
+
+
+def _certificate_available(context: Context, relation_count: int, tls: TLSMaterial):
+    # The provider issues the certificate the running catalogue requested.
+    state = _settled_state(context, relation_count)
+    relation, secret = _tls_material(tls)
+    state = dataclasses.replace(
+        state, relations=[*state.relations, relation], secrets=[*state.secrets, secret]
+    )
+    event = context.on.custom(
+        TLSCertificatesRequiresV4.on.certificate_available,  # pyright: ignore
+        **tls.certificate,
+    )
+    return event, state
+
+
+def _pebble_ready(context: Context, relation_count: int, _tls: TLSMaterial):
+    state = _fresh_state(relation_count)
+    return context.on.pebble_ready(state.get_container("catalogue")), state
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "catalogue-relation-changed": _relation_changed,
+    "config-changed": _config_changed,
+    "certificate-available": _certificate_available,
+    "pebble-ready": _pebble_ready,
+}
+
+
+def _measure(context: Context, event, state: State) -> Measure:
+    """Return the best-of-rounds time of dispatching `event`, and what it cost."""
+    timings = []
+    for _ in range(ROUNDS):
+        _drop_juju_log_handlers()
+        start = time.perf_counter()
+        context.run(event, state)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a run of its own, as tracing slows everything down. The timed
+    # runs before it warmed up the caches of the process, which aren't measured.
+    _drop_juju_log_handlers()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with context(event, state) as manager:
+            manager.run()
+            charm = manager.charm
+            pebble_calls, bytes_pushed = charm._pebble_calls, charm._bytes_pushed
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measure(
+        time_ms=round(min(timings) * 1000, 2),
+        pebble_calls=pebble_calls,
+        bytes_pushed=bytes_pushed,
+        peak_memory_kib=round(peak / 1024, 1),
+    )
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Load the baseline measures, by event and relation count, and update them on request."""
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    yield baseline
+    if UPDATE_BASELINE:
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def process_actions():
+    """Skip the process actions, which Scenario doesn't run."""
+    with patch.object(OpsContainer, "restart"), patch.object(OpsContainer, "send_signal"):
+        yield
+
+
+@pytest.fixture
+def isolated_logging():
+    """Silence the tracing backend, which warns about every span once shut down.
+
+    Scenario keeps the log lines of every run, which would weigh on the measures.
+    """
+    otel_logger = logging.getLogger("opentelemetry")
+    level = otel_logger.level
+    otel_logger.setLevel(logging.ERROR)
+    yield
+    otel_logger.setLevel(level)
+
+
+def _drop_juju_log_handlers():
+    """Drop the Juju log handlers left on the root logger by the earlier runs."""
+    root = logging.getLogger()
+    root.handlers = [
+        handler for handler in root.handlers if not isinstance(handler, JujuLogHandler)
+    ]
+
+
+@pytest.mark.parametrize("relation_count", RELATION_COUNTS)
+@pytest.mark.parametrize("event_name", SCENARIOS)
+@patch("socket.getfqdn", new=lambda: FQDN)
+def test_reconcile_cost(
+    baseline, tls, process_actions, isolated_logging, event_name, relation_count
+):
+    context = Context(CatalogueCharm)
+    event, state = SCENARIOS[event_name](context, relation_count, tls)
+    measure = _measure(context, event, state)
+
+    key = str(relation_count)
+    expected = baseline.get(event_name, {}).get(key)
+    report = (
+        f"\n{event_name:<27} {relation_count:>5} apps  {measure.time_ms:>9.2f} ms"
+        f"  {measure.pebble_calls:>3} pebble calls  {measure.bytes_pushed:>8} B pushed"
+        f"  {measure.peak_memory_kib:>9.1f} KiB peak"
+    )
+    if expected and not UPDATE_BASELINE:
+        report += (
+            f"  (x{measure.time_ms / expected['time_ms']:.2f} time,"
+            f" x{measure.peak_memory_kib / expected['peak_memory_kib']:.2f} memory)"
+        )
+    print(report)
+
+    if UPDATE_BASELINE:
+        baseline.setdefault(event_name, {})[key] = dataclasses.asdict(measure)
+        return
+    if expected is None:
+        pytest.skip(f"No baseline for {event_name} with {relation_count} apps")
+    expected = Measure(**expected)
+
+    assert measure.pebble_calls <= expected.pebble_calls
+    tolerance = TLS_BYTES_TOLERANCE if event_name in TLS_EVENTS else 0
+    assert measure.bytes_pushed <= expected.bytes_pushed + tolerance
@@ -0,0 +1,85 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Startup benchmark: time spent in `CatalogueCharm.__init__` as the catalogue grows.
+
+Run with `tox -e benchmark`; the timings are printed as a table, and fail the run if the
+constructor slows down as relations are added.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from charms.catalogue_k8s.v1.catalogue import CatalogueProvider
+from ops.testing import Container, Context, Relation, State
+
+from charm import CatalogueCharm
+
+RELATION_COUNTS = (1, 10, 100, 1000)
+ROUNDS = 5
+# Init time with the most relations, relative to the fewest, beyond which it is deemed to
+# grow with the relation count rather than to be noise.
+GROWTH_TOLERANCE = 3
+
+
+def _state(relation_count: int) -> State:
+    relations = [
+        Relation(
+            endpoint="catalogue",
+            remote_app_name=f"app-{i}",
+            remote_app_data={"name": f"app-{i}", "url": f"http://app-{i}", "icon": "rainbow"},
+        )
+        for i in range(relation_count)
+    ]
+    return State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=relations,
+    )
+
+
+def _init_time(relation_count: int) -> float:
+    """Return the best-of-rounds time spent in the charm's constructor for update-status."""
+    init = CatalogueCharm.__init__
+    timings = []
+
+    def timed_init(self, *args):
+        start = time.perf_counter()
+        init(self, *args)
+        timings.append(time.perf_counter() - start)
+
+    context = Context(CatalogueCharm)
+    state = _state(relation_count)
+    with patch.object(CatalogueCharm, "__init__", timed_init):
+        for _ in range(ROUNDS):
+            context.run(context.on.update_status(), state)
+    return min(timings)
+
+
+def test_init_time_against_relation_count():
+    results = {n: _init_time(n) for n in RELATION_COUNTS}
+
+    print("\nrelations  init time (ms)")
+    for n, seconds in results.items():
+        print(f"{n:>9}  {seconds * 1000:>14.2f}")
+
+    # The constructor does no per-relation work
+    fewest, most = min(RELATION_COUNTS), max(RELATION_COUNTS)
+    assert results[most] < GROWTH_TOLERANCE * results[fewest]
+
+
+@pytest.mark.parametrize("relation_count", RELATION_COUNTS)
+def test_init_does_not_build_items(relation_count):
+    # GIVEN a catalogue with many related apps
+    context = Context(CatalogueCharm)
+    state = _state(relation_count)
+
+    # WHEN an unrelated event is dispatched
+    with patch.object(
+        CatalogueProvider, "_item_from_databag", side_effect=CatalogueProvider._item_from_databag
+    ) as build_item:
+        context.run(context.on.update_status(), state)
+
+    # THEN the catalogue items are not computed
+    build_item.assert_not_called()
@@ -0,0 +1,73 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, Optional
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from ops import pebble
+from ops.testing import Container, Context, Mount, State
+
+from charm import CatalogueCharm, TLSConfig
+
+
+@pytest.fixture
+def context():
+    return Context(CatalogueCharm)
+
+
+@pytest.fixture
+def catalogue_container(tmp_path):
+    """Return a factory of catalogue containers, with `files` on disk and `layer` running.
+
+    The directories of `files` (path in the container: content) and `dirs` are mounted
+    from the directories of `tmp_path` named after them, e.g. `/etc/nginx` from
+    `tmp_path / "nginx"`, where tests check what the charm pushed.
+    """
+
+    def container(
+        *,
+        layer: Optional[pebble.Layer] = None,
+        files: Optional[Dict[str, str]] = None,
+        dirs: Iterable[str] = (),
+    ) -> Container:
+        files = files or {}
+        locations = {str(PurePosixPath(path).parent) for path in files} | set(dirs)
+        mounts = {}
+        for location in locations:
+            name = PurePosixPath(location).name
+            (tmp_path / name).mkdir(exist_ok=True)
+            mounts[name] = Mount(location=location, source=tmp_path / name)
+        for path, content in files.items():
+            path = PurePosixPath(path)
+            (tmp_path / path.parent.name / path.name).write_text(content)
+        return Container(
+            name="catalogue",
+            can_connect=True,
+            layers={"catalogue": layer} if layer else {},
+            service_statuses={"catalogue": pebble.ServiceStatus.ACTIVE} if layer else {},
+            mounts=mounts,
+        )
+
+    return container
+
+
+@pytest.fixture
+def charm_layer():
+    """Return a factory of the Pebble layer the charm plans, for a given TLS config.
+
+    Tests building a running workload use it, rather than a copy of the layer, so that
+    they only assert the parts of the layer they are about.
+    """
+
+    def layer(tls_config: Optional[TLSConfig] = None) -> pebble.Layer:
+        context = Context(CatalogueCharm)
+        state = State(containers=[Container(name="catalogue", can_connect=True)])
+        with patch.object(
+            CatalogueCharm, "_tls_config", new_callable=PropertyMock, return_value=tls_config
+        ):
+            with context(context.on.update_status(), state) as manager:
+                return manager.charm._pebble_layer
+
+    return layer
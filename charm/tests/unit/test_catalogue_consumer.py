@@ -0,0 +1,80 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the relation data written by `CatalogueConsumer`."""
+
+import hashlib
+import json
+from unittest.mock import patch
+
+import pytest
+from charms.catalogue_k8s.v1.catalogue import (
+    PAYLOAD_HASH_KEY,
+    PAYLOAD_KEY,
+    SUPPORTED_FORMATS_KEY,
+    V1_KEYS,
+)
+from ops.model import RelationDataContent
+from ops.testing import Relation, State
+
+
+def test_payload_sent_to_v2_catalogue(context):
+    # GIVEN a parent catalogue reading the v2 wire format
+    relation = Relation(
+        endpoint="catalogue-item",
+        remote_app_data={SUPPORTED_FORMATS_KEY: json.dumps([1, 2])},
+    )
+
+    # WHEN the relation changes
+    state = context.run(
+        context.on.relation_changed(relation), State(leader=True, relations=[relation])
+    )
+
+    # THEN the item is sent as a single payload, with its hash
+    data = state.get_relation(relation.id).local_app_data
+    payload = json.loads(data[PAYLOAD_KEY])
+    assert payload["version"] == 2
+    assert payload["name"] == "Service Catalogue"
+    assert data[PAYLOAD_HASH_KEY] == hashlib.sha256(data[PAYLOAD_KEY].encode()).hexdigest()
+    # AND none of the v1 keys
+    assert not set(V1_KEYS) & set(data)
+
+
+def test_v1_keys_sent_to_v1_catalogue(context):
+    # GIVEN a parent catalogue that doesn't advertise the wire formats it reads
+    relation = Relation(endpoint="catalogue-item")
+
+    # WHEN the relation changes
+    state = context.run(
+        context.on.relation_changed(relation), State(leader=True, relations=[relation])
+    )
+
+    # THEN the item is sent with one key per field
+    data = state.get_relation(relation.id).local_app_data
+    assert data["name"] == "Service Catalogue"
+    assert data["url"] == "about:blank"
+    assert PAYLOAD_KEY not in data
+
+
+@pytest.mark.parametrize("remote_app_data", [{}, {SUPPORTED_FORMATS_KEY: json.dumps([1, 2])}])
+def test_unchanged_item_not_rewritten(context, remote_app_data):
+    # GIVEN a parent catalogue that already got the item
+    relation = Relation(endpoint="catalogue-item", remote_app_data=remote_app_data)
+    state = context.run(
+        context.on.relation_changed(relation), State(leader=True, relations=[relation])
+    )
+
+    with context(context.on.update_status(), state) as manager:
+        consumer = manager.charm._catalogue_consumer
+        item = manager.charm._catalogue_item
+        # WHEN the same item is sent again
+        with patch.object(RelationDataContent, "__setitem__") as write:
+            changed = consumer.update_item(item)
+
+        # THEN nothing is written
+        assert not changed
+        write.assert_not_called()
+
+        # AND an updated item is written
+        item.description = "updated"
+        assert consumer.update_item(item)
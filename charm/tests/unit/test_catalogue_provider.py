@@ -0,0 +1,237 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for `CatalogueProvider`: items, wire formats and `items_changed` coalescing."""
+
+import dataclasses
+import json
+from unittest.mock import patch
+
+import pytest
+from charms.catalogue_k8s.v1.catalogue import (
+    PAYLOAD_HASH_KEY,
+    PAYLOAD_KEY,
+    SUPPORTED_FORMATS_KEY,
+    CatalogueItemsChangedEvent,
+    CatalogueProvider,
+)
+from ops.testing import Container, Relation, State
+
+REMOTE_APP_DATA = {"name": "remote", "url": "http://remote", "icon": "rainbow"}
+
+
+def _items_changed_events(context):
+    return [e for e in context.emitted_events if isinstance(e, CatalogueItemsChangedEvent)]
+
+
+def test_items_changed_emitted_for_new_items(context):
+    # GIVEN a catalogue with a related app
+    relation = Relation(endpoint="catalogue", remote_app_data=REMOTE_APP_DATA)
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+
+    # WHEN its data comes in for the first time
+    context.run(context.on.relation_changed(relation), state)
+
+    # THEN the charm is notified about the new items
+    assert len(_items_changed_events(context)) == 1
+
+
+def test_items_changed_coalesced_when_items_unchanged(context):
+    # GIVEN a catalogue that already rendered the item of a related app
+    relation = Relation(endpoint="catalogue", remote_app_data=REMOTE_APP_DATA)
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+    state = context.run(context.on.relation_joined(relation), state)
+    assert len(_items_changed_events(context)) == 1
+
+    # WHEN relation-changed fires with the same data
+    context.run(context.on.relation_changed(state.get_relation(relation.id)), state)
+
+    # THEN no further items_changed is emitted
+    assert len(_items_changed_events(context)) == 1
+
+
+def test_should_emit_reflects_last_emitted_items(context):
+    relation = Relation(endpoint="catalogue", remote_app_data=REMOTE_APP_DATA)
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+    state = context.run(context.on.relation_joined(relation), state)
+
+    with context(context.on.update_status(), state) as manager:
+        provider = manager.charm._info
+        assert not provider.should_emit(provider.items)
+        assert provider.should_emit([{**provider.items[0], "icon": "other"}])
+        assert provider.should_emit([])
+
+
+def test_items_computed_once_per_dispatch(context):
+    # GIVEN a catalogue with a related app
+    relation = Relation(endpoint="catalogue", remote_app_data=REMOTE_APP_DATA)
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+
+    with context(context.on.update_status(), state) as manager:
+        provider = manager.charm._info
+        # WHEN the items are accessed repeatedly
+        items = provider.items
+        # THEN they are only built once
+        assert provider.items is items
+        assert items == [
+            {
+                "name": "remote",
+                "url": "http://remote",
+                "icon": "rainbow",
+                "description": "",
+                "api_docs": "",
+                "api_endpoints": {},
+            }
+        ]
+
+
+def test_supported_formats_advertised(context):
+    # GIVEN a catalogue leader
+    relation = Relation(endpoint="catalogue")
+    state = State(leader=True, relations=[relation])
+
+    # WHEN an app relates to it
+    state = context.run(context.on.relation_created(relation), state)
+
+    # THEN the catalogue advertises the wire formats it reads
+    local_app_data = state.get_relation(relation.id).local_app_data
+    assert json.loads(local_app_data[SUPPORTED_FORMATS_KEY]) == [1, 2]
+
+
+@pytest.mark.parametrize("event", ["upgrade_charm", "leader_elected"])
+def test_supported_formats_advertised_to_existing_relations(context, event):
+    # GIVEN relations that predate the v2 wire format
+    relations = [Relation(endpoint="catalogue"), Relation(endpoint="catalogue")]
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=relations,
+    )
+
+    # WHEN the charm is upgraded, or its unit becomes leader
+    state = context.run(getattr(context.on, event)(), state)
+
+    # THEN the catalogue advertises the wire formats it reads on every relation
+    for relation in relations:
+        local_app_data = state.get_relation(relation.id).local_app_data
+        assert json.loads(local_app_data[SUPPORTED_FORMATS_KEY]) == [1, 2]
+
+
+def test_items_read_from_payload(context):
+    # GIVEN an app sending its item with the v2 wire format
+    payload = json.dumps({"version": 2, **REMOTE_APP_DATA, "api_endpoints": {"API": "/api"}})
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_data={PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    state = State(leader=True, relations=[relation])
+
+    with context(context.on.update_status(), state) as manager:
+        # THEN its item is read from the payload
+        assert manager.charm._info.items == [
+            {
+                "name": "remote",
+                "url": "http://remote",
+                "icon": "rainbow",
+                "description": "",
+                "api_docs": "",
+                "api_endpoints": {"API": "/api"},
+            }
+        ]
+
+
+@pytest.mark.parametrize("payload", ["{not json", "[1, 2]", '"item"', "null"])
+def test_malformed_payload_falls_back_to_v1_keys(context, payload):
+    # GIVEN an app sending a malformed payload, along with the v1 keys
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_data={**REMOTE_APP_DATA, PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    state = State(leader=True, relations=[relation])
+
+    with context(context.on.update_status(), state) as manager:
+        # THEN its item is read from the v1 keys
+        assert manager.charm._info.items == [
+            {
+                **REMOTE_APP_DATA,
+                "description": "",
+                "api_docs": "",
+                "api_endpoints": {},
+            }
+        ]
+
+
+def test_unchanged_payload_skipped(context):
+    # GIVEN a catalogue that already read the payload of a related app
+    payload = json.dumps({"version": 2, **REMOTE_APP_DATA})
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_data={PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+    state = context.run(context.on.relation_changed(relation), state)
+
+    # WHEN relation-changed fires with the same payload hash
+    with patch.object(
+        CatalogueProvider, "_item_from_databag", side_effect=CatalogueProvider._item_from_databag
+    ) as item_from_databag:
+        context.run(context.on.relation_changed(state.get_relation(relation.id)), state)
+
+    # THEN the payload isn't even parsed
+    item_from_databag.assert_not_called()
+
+
+def test_payload_read_again_after_v1_data(context):
+    # GIVEN a catalogue that read the payload of a related app
+    payload = json.dumps({"version": 2, **REMOTE_APP_DATA})
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_data={PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    state = State(
+        leader=True,
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[relation],
+    )
+    state = context.run(context.on.relation_changed(relation), state)
+    # AND the app downgraded to the v1 wire format, with another url
+    relation = dataclasses.replace(
+        state.get_relation(relation.id),
+        remote_app_data={**REMOTE_APP_DATA, "url": "http://remote/v1"},
+    )
+    state = dataclasses.replace(state, relations=[relation])
+    state = context.run(context.on.relation_changed(relation), state)
+
+    # WHEN the app is upgraded again, sending the same payload as before
+    relation = dataclasses.replace(
+        state.get_relation(relation.id),
+        remote_app_data={PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    state = dataclasses.replace(state, relations=[relation])
+    with patch.object(
+        CatalogueProvider, "_item_from_databag", side_effect=CatalogueProvider._item_from_databag
+    ) as item_from_databag:
+        context.run(context.on.relation_changed(relation), state)
+
+    # THEN the payload is read again
+    item_from_databag.assert_called()
@@ -30,19 +30,13 @@ class TestCharm(unittest.TestCase):
         self.harness.begin_with_initial_hooks()
 
     def test_catalogue_pebble_ready(self):
-        expected_plan = {
-            "services": {
-                "catalogue": {
-                    "override": "replace",
-                    "summary": "catalogue",
-                    "command": "nginx -g 'daemon off;' -c /etc/nginx/nginx.conf",
-                    "startup": "enabled",
-                }
-            },
-        }
-
-        initial_plan = self._plan.to_dict()
-        self.assertEqual(expected_plan, initial_plan)
+        plan = self._plan
+        self.assertEqual(
+            plan.services["catalogue"].command,
+            "nginx -g 'daemon off;' -c /etc/nginx/nginx.conf",
+        )
+        self.assertEqual(plan.services["catalogue"].startup, "enabled")
+        self.assertEqual(set(plan.checks), {"catalogue-alive", "catalogue-ready"})
 
         service = self._container.get_service("catalogue")
         self.assertTrue(service.is_running())
@@ -0,0 +1,145 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the federation of catalogues."""
+
+import json
+from unittest.mock import patch
+
+from charms.catalogue_k8s.v1.catalogue import (
+    PAYLOAD_HASH_KEY,
+    PAYLOAD_KEY,
+    SUPPORTED_FORMATS_KEY,
+)
+from ops.testing import Container, Relation, State
+
+import federation
+
+GRAFANA = {"name": "grafana", "url": "http://grafana", "icon": "chart"}
+LOKI = {"name": "loki", "url": "http://loki", "icon": "math-log"}
+
+
+def _item(**fields) -> dict:
+    return {**federation.ITEM_DEFAULTS, **fields}
+
+
+def _tree(catalogue_id, items, children=()) -> dict:
+    return {"id": catalogue_id, "items": items, "children": list(children)}
+
+
+def test_tree_is_compact():
+    tree = federation.tree("child", [_item(**GRAFANA), _item(**GRAFANA)], max_depth=3)
+
+    # Empty fields are left out, and duplicates only sent once
+    assert tree == _tree("child", [GRAFANA])
+
+
+def test_tree_prunes_cycles():
+    # GIVEN a child catalogue that forwards the items of its parent
+    parent_entry = _item(name="parent", federation=_tree("parent", [LOKI]))
+
+    # WHEN the parent builds its own tree from it
+    tree = federation.tree("parent", [_item(**GRAFANA), parent_entry], max_depth=3)
+
+    # THEN the parent isn't forwarded below itself
+    assert tree["children"] == []
+
+
+def test_merge_items_of_federated_catalogues():
+    # GIVEN a child catalogue forwarding its items, and those of its own child
+    child_entry = _item(
+        name="child", federation=_tree("child", [GRAFANA], [_tree("grandchild", [LOKI])])
+    )
+
+    # WHEN the parent merges them
+    items = federation.merge("parent", [child_entry], max_depth=3)
+
+    # THEN they are listed along with the child's own entry
+    assert items == [_item(name="child"), _item(**GRAFANA), _item(**LOKI)]
+
+
+def test_merge_bounded_in_depth():
+    child_entry = _item(
+        name="child", federation=_tree("child", [GRAFANA], [_tree("grandchild", [LOKI])])
+    )
+
+    items = federation.merge("parent", [child_entry], max_depth=1)
+
+    assert items == [_item(name="child"), _item(**GRAFANA)]
+
+
+def test_merge_skips_known_items():
+    child_entry = _item(name="child", federation=_tree("child", [GRAFANA]))
+
+    items = federation.merge("parent", [_item(**GRAFANA), child_entry], max_depth=3)
+
+    assert items == [_item(**GRAFANA), _item(name="child")]
+
+
+def test_merge_without_federation_keeps_items():
+    items = [_item(**GRAFANA)]
+
+    assert federation.merge("parent", items, max_depth=3) is items
+
+
+def test_parent_lists_federated_items(context, catalogue_container, tmp_path):
+    # GIVEN a parent catalogue related to a federating child
+    payload = json.dumps(
+        {"version": 2, "name": "child", "federation": _tree("child", [GRAFANA, LOKI])}
+    )
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_data={PAYLOAD_KEY: payload, PAYLOAD_HASH_KEY: "hash"},
+    )
+    container = catalogue_container(dirs=["/web"])
+
+    # WHEN the child's payload comes in
+    context.run(
+        context.on.relation_changed(relation),
+        State(leader=True, containers=[container], relations=[relation]),
+    )
+
+    # THEN the parent lists the child's items along with the child's entry
+    apps = json.loads((tmp_path / "web" / "config.json").read_text())["apps"]
+    assert [app["name"] for app in apps] == ["child", "grafana", "loki"]
+
+
+def test_items_merged_once_per_dispatch(context):
+    # GIVEN a federating catalogue, related to an app and to a parent catalogue
+    app_relation = Relation(endpoint="catalogue", remote_app_data=GRAFANA)
+    parent_relation = Relation(endpoint="catalogue-item")
+    state = State(
+        leader=True,
+        config={"federate": True},
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[app_relation, parent_relation],
+    )
+
+    # WHEN the app's item comes in, to be rendered and forwarded to the parent
+    with patch.object(federation, "merge", wraps=federation.merge) as merge:
+        context.run(context.on.relation_changed(app_relation), state)
+
+    # THEN the items are only merged once
+    merge.assert_called_once()
+
+
+def test_child_forwards_its_items(context):
+    # GIVEN a federating catalogue, related to an app and to a parent catalogue
+    app_relation = Relation(endpoint="catalogue", remote_app_data=GRAFANA)
+    parent_relation = Relation(
+        endpoint="catalogue-item",
+        remote_app_data={SUPPORTED_FORMATS_KEY: json.dumps([1, 2])},
+    )
+    state = State(
+        leader=True,
+        config={"federate": True},
+        containers=[Container(name="catalogue", can_connect=True)],
+        relations=[app_relation, parent_relation],
+    )
+
+    # WHEN the app's item comes in
+    state = context.run(context.on.relation_changed(app_relation), state)
+
+    # THEN the item is forwarded to the parent
+    payload = json.loads(state.get_relation(parent_relation.id).local_app_data[PAYLOAD_KEY])
+    assert payload["federation"]["items"] == [GRAFANA]
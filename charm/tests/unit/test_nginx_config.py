@@ -0,0 +1,224 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the nginx config builder and its tuning options."""
+
+import pytest
+from ops.model import BlockedStatus
+from ops.testing import Container, State
+
+from nginx_config import NginxConfigBuilder, worker_processes_for
+
+
+@pytest.mark.parametrize(
+    "cpu_max, expected",
+    [
+        ("max 100000", None),
+        ("100000 100000", 1),
+        ("150000 100000", 2),
+        ("50000 100000", 1),
+        ("400000 100000\n", 4),
+        ("", None),
+    ],
+)
+def test_worker_processes_for_cpu_limit(cpu_max, expected):
+    assert worker_processes_for(cpu_max) == expected
+
+
+def test_default_profile():
+    config = NginxConfigBuilder().build()
+
+    assert "worker_processes      auto;" in config
+    assert "worker_connections  4096;" in config
+    assert "worker_rlimit_nofile  8192;" in config
+    assert "multi_accept        on;" in config
+    for directive in ("sendfile", "tcp_nopush", "tcp_nodelay"):
+        assert f"{directive} " in config
+    assert "open_file_cache           max=1000 inactive=60s;" in config
+    assert "listen               80;" in config
+
+
+def test_tls_profile():
+    config = NginxConfigBuilder(tls=True).build()
+
+    assert "listen               443 ssl;" in config
+    assert "ssl_session_cache         shared:SSL:10m;" in config
+
+
+@pytest.mark.parametrize("worker_processes", ["0", "-1", "many", 0])
+def test_invalid_worker_processes(worker_processes):
+    with pytest.raises(ValueError):
+        NginxConfigBuilder(worker_processes=worker_processes)
+
+
+def test_invalid_worker_connections():
+    with pytest.raises(ValueError):
+        NginxConfigBuilder(worker_connections=0)
+
+
+@pytest.fixture
+def limited_container(catalogue_container):
+    """Return a factory of containers limited to `cpu_max`, as read from their cgroup."""
+
+    def container(cpu_max: str) -> Container:
+        return catalogue_container(files={"/sys/fs/cgroup/cpu.max": cpu_max}, dirs=["/etc/nginx"])
+
+    return container
+
+
+def test_workers_sized_to_container_cpu_limit(context, limited_container, tmp_path):
+    # GIVEN a workload container limited to 1.5 CPUs
+    container = limited_container("150000 100000")
+
+    # WHEN the charm configures nginx with the default settings
+    context.run(context.on.pebble_ready(container), State(containers=[container]))
+
+    # THEN nginx runs two workers
+    assert "worker_processes      2;" in (tmp_path / "nginx" / "nginx.conf").read_text()
+
+
+def test_workers_from_config(context, limited_container, tmp_path):
+    # GIVEN an explicit number of workers and connections
+    container = limited_container("max 100000")
+    state = State(
+        containers=[container], config={"worker_processes": "3", "worker_connections": 512}
+    )
+
+    # WHEN the charm configures nginx
+    context.run(context.on.config_changed(), state)
+
+    # THEN the configured values are used
+    config = (tmp_path / "nginx" / "nginx.conf").read_text()
+    assert "worker_processes      3;" in config
+    assert "worker_connections  512;" in config
+
+
+def test_invalid_config_blocks(context, limited_container):
+    container = limited_container("max 100000")
+    state = State(containers=[container], config={"worker_processes": "lots"})
+
+    state_out = context.run(context.on.config_changed(), state)
+
+    assert state_out.unit_status.name == "blocked"
+
+
+@pytest.mark.parametrize("tls", [False, True])
+def test_compression(tls):
+    config = NginxConfigBuilder(tls=tls).build()
+
+    # Precompressed assets are served as is
+    assert "gzip_static               on;" in config
+    # AND config.json is compressed on the fly
+    assert "gzip                      on;" in config
+    assert "gzip_types                application/json;" in config
+
+
+@pytest.mark.parametrize("tls", [False, True])
+def test_cache_headers(tls):
+    config = NginxConfigBuilder(tls=tls).build()
+
+    # Hashed assets are cached for good
+    assert (
+        'location /assets/ {\n'
+        '            add_header       Cache-Control "public, max-age=31536000, immutable";'
+    ) in config
+    # AND the entry point, catalogue config and service worker are revalidated with their ETag
+    assert "etag                 on;" in config
+    for path in ("/index.html", "/config.json", "/sw.js"):
+        assert (
+            f'location = {path} {{\n'
+            '            add_header       Cache-Control "no-cache";'
+        ) in config
+    # AND the files the charm rewrites are always read from disk, for their ETag to be fresh
+    for path in ("/index.html", "/config.json"):
+        assert (
+            f'location = {path} {{\n'
+            '            add_header       Cache-Control "no-cache";\n'
+            "            open_file_cache  off;"
+        ) in config
+
+
+def test_bundled_icons_are_cached():
+    config = NginxConfigBuilder().build()
+
+    assert (
+        'location /icons/ {\n'
+        '            add_header       Cache-Control "public, max-age=86400";'
+    ) in config
+
+
+@pytest.mark.parametrize("tls", [False, True])
+def test_status_server(tls):
+    config = NginxConfigBuilder(tls=tls).build()
+
+    # Health checks are answered on a port only reachable from within the pod
+    assert "listen               127.0.0.1:8081;" in config
+    assert "location = /healthz {\n            return           204;" in config
+    # AND so are the status counters the exporter scrapes
+    assert "location = /stub_status {\n            stub_status;" in config
+
+
+def test_access_log_full():
+    config = NginxConfigBuilder().build()
+
+    # Every request is logged as JSON, with its timings
+    assert "log_format  json  escape=json" in config
+    assert '"request_time":$request_time' in config
+    assert '"upstream_cache_status":"$upstream_cache_status"' in config
+    assert '"ssl_session_reused":"$ssl_session_reused"' in config
+    assert "access_log                /dev/stdout json;" in config
+
+
+def test_access_log_sampled():
+    config = NginxConfigBuilder(access_log="sampled", access_log_sample_rate=2.5).build()
+
+    assert "split_clients $request_id $access_log_sampled {\n        2.5%  1;" in config
+    assert "access_log                /dev/stdout json if=$access_log_sampled;" in config
+
+
+def test_access_log_off():
+    config = NginxConfigBuilder(access_log="off").build()
+
+    assert "log_format" not in config
+    assert "/dev/stdout" not in config
+
+
+@pytest.mark.parametrize(
+    "access_log, sample_rate",
+    [("verbose", 10.0), ("sampled", 0.0), ("sampled", 101.0), ("sampled", 0.125)],
+)
+def test_invalid_access_log(access_log, sample_rate):
+    with pytest.raises(ValueError):
+        NginxConfigBuilder(access_log=access_log, access_log_sample_rate=sample_rate)
+
+
+def test_access_log_from_config(context, limited_container, tmp_path):
+    # GIVEN access logs sampled at 1%
+    container = limited_container("max 100000")
+    state = State(
+        containers=[container],
+        config={"access_log": "sampled", "access_log_sample_rate": 1.0},
+    )
+
+    # WHEN the charm configures nginx
+    context.run(context.on.config_changed(), state)
+
+    # THEN one request in a hundred is logged
+    config = (tmp_path / "nginx" / "nginx.conf").read_text()
+    assert "1%  1;" in config
+
+
+def test_too_precise_sample_rate_blocks(context, limited_container):
+    # GIVEN access logs sampled at a rate nginx cannot express
+    container = limited_container("max 100000")
+    state = State(
+        containers=[container],
+        config={"access_log": "sampled", "access_log_sample_rate": 0.125},
+    )
+
+    # WHEN the charm configures nginx
+    state = context.run(context.on.config_changed(), state)
+
+    # THEN the charm is blocked on the invalid rate
+    assert isinstance(state.unit_status, BlockedStatus)
+    assert "two decimals" in state.unit_status.message
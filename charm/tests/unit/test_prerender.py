@@ -0,0 +1,187 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the pre-rendered index.html."""
+
+import dataclasses
+import json
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from ops.model import Container as OpsContainer
+from ops.testing import Relation, State
+
+import prerender
+from charm import INDEX_TEMPLATE_PATH
+from prerender import ROOT_ELEMENT, render_app, render_index
+
+TEMPLATE = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8" /></head>'
+    '<body><div id="root"></div><script type="module" src="/assets/index.js"></script></body></html>'
+)
+APP = {
+    "name": "Grafana",
+    "url": "http://grafana",
+    "icon": "bar-chart",
+    "description": "Dashboards",
+    "api_docs": "",
+    "api_endpoints": {"Health": "http://grafana/api/health"},
+}
+
+
+def _inline_config(index: str) -> dict:
+    match = re.search(
+        r'<script id="catalogue-config" type="application/json">(.*?)</script>', index
+    )
+    assert match
+    return json.loads(match.group(1))
+
+
+def test_render_app():
+    markup = render_app({"title": "Catalogue", "tagline": "Hi", "apps": [APP]})
+
+    assert '<span class="p-navigation__logo-title" id="nav">Catalogue</span>' in markup
+    assert "<h1>Hi</h1>" in markup
+    assert "Grafana</h3>" in markup
+    assert 'href="http://grafana"' in markup
+    assert '<p class="p-matrix__desc">Dashboards</p>' in markup
+    # There are no docs to link to, but endpoints to show
+    assert markup.count("disabled") == 1
+
+
+def test_render_app_icons():
+    unsafe = {**APP, "name": "Unsafe", "icon": '"><script>alert(1)</script>'}
+
+    markup = render_app({"apps": [APP, unsafe]})
+
+    # The icons are the ones bundled with the UI, so they show without JavaScript
+    assert '<img src="icons/mdi/bar-chart.svg" alt="">' in markup
+    assert '<img src="icons/mdi/web.svg" alt="">' in markup
+    # AND names which aren't icon names are left out
+    assert "alert(1)" not in markup
+
+
+def test_render_app_without_apps():
+    markup = render_app({"title": "Catalogue", "apps": []})
+
+    assert "No items to display" in markup
+    assert 'id="apps"' not in markup
+
+
+def test_render_app_with_links():
+    links = [{"category": "Docs", "items": [{"name": "Juju", "url": "https://juju.is"}]}]
+    markup = render_app({"apps": [], "links": links})
+
+    assert '<ul class="p-matrix" id="links">' in markup
+    assert '<li><a href="https://juju.is">Juju</a></li>' in markup
+
+
+def test_render_index_inlines_config():
+    config = {"title": "Catalogue", "apps": [APP]}
+
+    index = render_index(TEMPLATE, config)
+
+    assert "<title>Catalogue</title></head>" in index
+    assert '<div id="root"><header' in index
+    assert _inline_config(index) == config
+
+
+def test_render_index_escapes_content():
+    app = {**APP, "name": "</script><script>alert(1)</script>"}
+
+    index = render_index(TEMPLATE, {"apps": [app]})
+
+    assert "<script>alert(1)" not in index
+    assert _inline_config(index)["apps"][0]["name"] == app["name"]
+
+
+def test_render_index_without_root_element_raises():
+    with pytest.raises(ValueError):
+        render_index("<html><body></body></html>", {"apps": []})
+
+
+def test_charm_prerenders_index(context, catalogue_container, tmp_path):
+    # GIVEN a catalogue container whose image ships the index template
+    container = catalogue_container(files={"/web/index.template.html": TEMPLATE})
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_name="remote",
+        remote_app_data={"name": "remote", "url": "http://remote", "icon": "rainbow"},
+    )
+
+    # WHEN a catalogue item comes in
+    context.run(
+        context.on.relation_changed(relation),
+        State(leader=True, containers=[container], relations=[relation]),
+    )
+
+    # THEN the item is rendered into index.html, along with the config to hydrate
+    index = (tmp_path / "web" / "index.html").read_text()
+    assert "remote</h3>" in index
+    assert _inline_config(index)["apps"][0]["name"] == "remote"
+
+
+def test_template_pulled_once_per_container(context, catalogue_container, tmp_path):
+    # GIVEN a catalogue that pre-rendered the item of a related app
+    container = catalogue_container(files={"/web/index.template.html": TEMPLATE})
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_name="remote",
+        remote_app_data={"name": "remote", "url": "http://remote", "icon": "rainbow"},
+    )
+    state = State(leader=True, containers=[container], relations=[relation])
+    state = context.run(context.on.relation_changed(relation), state)
+
+    # WHEN the item changes
+    relation = dataclasses.replace(
+        state.get_relation(relation.id),
+        remote_app_data={"name": "remote", "url": "http://remote/v2", "icon": "rainbow"},
+    )
+    state = dataclasses.replace(state, relations=[relation])
+    with patch.object(OpsContainer, "pull", autospec=True, side_effect=OpsContainer.pull) as pull:
+        state = context.run(context.on.relation_changed(relation), state)
+
+    # THEN the index is rendered again, without pulling the template
+    assert "http://remote/v2" in (tmp_path / "web" / "index.html").read_text()
+    assert INDEX_TEMPLATE_PATH not in [call.args[1] for call in pull.call_args_list]
+
+    # AND WHEN the container is recreated
+    with patch.object(OpsContainer, "pull", autospec=True, side_effect=OpsContainer.pull) as pull:
+        context.run(context.on.pebble_ready(container), state)
+
+    # THEN the template is pulled again
+    assert INDEX_TEMPLATE_PATH in [call.args[1] for call in pull.call_args_list]
+
+
+# The UI sources of every workload version, which the pre-rendered markup must match.
+UI_PATHS = sorted((Path(__file__).parents[3] / "workload").glob("*/ui"))
+
+
+def _prerendered_classes() -> set:
+    """Return the class names in the markup `prerender` renders."""
+    source = Path(prerender.__file__).read_text()
+    attributes = re.findall(r'class="([^"{]+)"', source)
+    icons = re.findall(r'_icon\([^,]+, "([^"]+)"', source)
+    return {name for classes in attributes + icons for name in classes.split()}
+
+
+@pytest.mark.parametrize("ui_path", UI_PATHS, ids=lambda path: path.parent.name)
+def test_prerendered_markup_matches_ui(ui_path):
+    # GIVEN the sources of the UI hydrating the pre-rendered page
+    sources = "".join(
+        path.read_text()
+        for path in (ui_path / "src").rglob("*")
+        if path.suffix in (".js", ".jsx", ".css", ".scss")
+    )
+
+    # THEN its template has the root element the charm renders into
+    assert ROOT_ELEMENT in (ui_path / "index.html").read_text()
+    # AND every class the charm renders is one the UI uses, or styles
+    missing = {
+        name
+        for name in _prerendered_classes()
+        if not re.search(rf"(?<![\w-]){re.escape(name)}(?![\w-])", sources)
+    }
+    assert not missing
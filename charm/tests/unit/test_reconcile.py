@@ -0,0 +1,278 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the process action taken by `_configure` depending on what changed."""
+
+import dataclasses
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ops import pebble
+from ops.model import ActiveStatus, BlockedStatus, WaitingStatus
+from ops.model import Container as OpsContainer
+from ops.testing import CheckInfo, Container, Relation, State, StoredState
+
+from charm import EXPORTER_PATH
+from nginx_config import NGINX_CONFIG_PATH, NginxConfigBuilder
+
+
+@pytest.fixture
+def process_actions():
+    with patch.object(OpsContainer, "restart") as restart, patch.object(
+        OpsContainer, "send_signal"
+    ) as send_signal:
+        yield restart, send_signal
+
+
+@pytest.fixture
+def running_container(catalogue_container):
+    """Return a factory of containers with `layer` running and `nginx_config` on disk."""
+
+    def container(layer: pebble.Layer, nginx_config: str) -> Container:
+        return catalogue_container(
+            layer=layer, files={NGINX_CONFIG_PATH: nginx_config}, dirs=["/web"]
+        )
+
+    return container
+
+
+def test_config_json_change_triggers_no_process_action(
+    context, running_container, tmp_path, charm_layer, process_actions
+):
+    # GIVEN a running catalogue whose nginx config is up to date
+    restart, send_signal = process_actions
+    container = running_container(charm_layer(), NginxConfigBuilder().build())
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_name="remote",
+        remote_app_data={"name": "remote", "url": "http://remote", "icon": "rainbow"},
+    )
+    state = State(leader=True, containers=[container], relations=[relation])
+
+    # WHEN a new catalogue item comes in
+    context.run(context.on.relation_changed(relation), state)
+
+    # THEN config.json is updated
+    assert '"name": "remote"' in (tmp_path / "web" / "config.json").read_text()
+    # AND nginx is neither restarted nor reloaded
+    restart.assert_not_called()
+    send_signal.assert_not_called()
+
+
+def test_nginx_config_change_triggers_reload(
+    context, running_container, tmp_path, charm_layer, process_actions
+):
+    # GIVEN a running catalogue whose nginx config is outdated
+    restart, send_signal = process_actions
+    container = running_container(charm_layer(), "outdated config")
+    state = State(leader=True, containers=[container])
+
+    # WHEN the charm reconciles
+    context.run(context.on.config_changed(), state)
+
+    # THEN the new nginx config is pushed
+    assert (tmp_path / "nginx" / "nginx.conf").read_text() == NginxConfigBuilder().build()
+    # AND nginx is gracefully reloaded instead of restarted
+    send_signal.assert_called_once_with("SIGHUP", "catalogue")
+    restart.assert_not_called()
+
+
+def test_pebble_layer_change_triggers_restart(context, process_actions):
+    # GIVEN a catalogue container without the charm's pebble layer
+    restart, send_signal = process_actions
+    container = Container(name="catalogue", can_connect=True)
+    state = State(leader=True, containers=[container])
+
+    # WHEN pebble becomes ready
+    context.run(context.on.pebble_ready(container), state)
+
+    # THEN the service is fully restarted
+    restart.assert_called_once_with("catalogue")
+    send_signal.assert_not_called()
+
+
+@pytest.fixture
+def exporter_container(catalogue_container):
+    """Return a factory of containers whose image ships the exporter, or predates it."""
+
+    def container(image_ships_exporter: bool) -> Container:
+        files = {EXPORTER_PATH: ""} if image_ships_exporter else {}
+        return catalogue_container(files=files, dirs=["/usr/bin"])
+
+    return container
+
+
+@pytest.mark.parametrize("image_ships_exporter", [False, True])
+def test_exporter_needs_its_binary(
+    context, exporter_container, process_actions, image_ships_exporter
+):
+    # GIVEN a catalogue image shipping the exporter, or predating it, related to Prometheus
+    container = exporter_container(image_ships_exporter)
+    relation = Relation(endpoint="metrics-endpoint")
+    state = State(leader=True, containers=[container], relations=[relation])
+
+    # WHEN pebble becomes ready
+    state = context.run(context.on.pebble_ready(container), state)
+
+    # THEN the exporter only runs if the image ships it
+    plan = state.get_container("catalogue").plan
+    assert ("nginx-prometheus-exporter" in plan.services) == image_ships_exporter
+    assert isinstance(state.unit_status, ActiveStatus)
+    # AND Prometheus is only asked to scrape it if it runs
+    app_data = state.get_relation(relation.id).local_app_data
+    if image_ships_exporter:
+        assert json.loads(app_data["scrape_jobs"])[0]["static_configs"] == [
+            {"targets": ["*:9113"]}
+        ]
+    else:
+        assert "scrape_jobs" not in app_data
+
+
+def test_running_exporter_advertised_to_new_prometheus(context, exporter_container):
+    # GIVEN a catalogue running the exporter
+    container = exporter_container(image_ships_exporter=True)
+    relation = Relation(endpoint="metrics-endpoint")
+    stored = StoredState(owner_path="CatalogueCharm", content={"exporter": True})
+    state = State(
+        leader=True, containers=[container], relations=[relation], stored_states=[stored]
+    )
+
+    # WHEN Prometheus relates to it
+    state = context.run(context.on.relation_joined(relation), state)
+
+    # THEN it is asked to scrape the exporter
+    assert "scrape_jobs" in state.get_relation(relation.id).local_app_data
+
+
+def test_exporter_withdrawn_with_its_binary(context, exporter_container, process_actions):
+    # GIVEN a catalogue that advertised its exporter, back on an image predating it
+    container = exporter_container(image_ships_exporter=False)
+    relation = Relation(endpoint="metrics-endpoint", local_app_data={"scrape_jobs": "[]"})
+    stored = StoredState(owner_path="CatalogueCharm", content={"exporter": True})
+    state = State(
+        leader=True, containers=[container], relations=[relation], stored_states=[stored]
+    )
+
+    # WHEN pebble becomes ready
+    state = context.run(context.on.pebble_ready(container), state)
+
+    # THEN Prometheus is no longer asked to scrape it
+    assert "scrape_jobs" not in state.get_relation(relation.id).local_app_data
+
+
+def test_failing_autostart_blocks(context):
+    # GIVEN a catalogue container without the charm's pebble layer
+    container = Container(name="catalogue", can_connect=True)
+    state = State(leader=True, containers=[container])
+
+    # WHEN pebble fails to start the services
+    error = pebble.ChangeError("cannot start service", MagicMock(tasks=[]))
+    with patch.object(OpsContainer, "autostart", side_effect=error):
+        state = context.run(context.on.pebble_ready(container), state)
+
+    # THEN the charm is blocked, rather than the hook failing
+    assert isinstance(state.unit_status, BlockedStatus)
+    assert "cannot start service" in state.unit_status.message
+
+
+def test_fingerprint_cache_avoids_pulling_files(
+    context, running_container, charm_layer, process_actions
+):
+    # GIVEN a running catalogue
+    container = running_container(charm_layer(), NginxConfigBuilder().build())
+    state = State(leader=True, containers=[container])
+    # AND a first reconcile that fingerprinted the pushed files
+    state = context.run(context.on.config_changed(), state)
+    assert state.get_stored_state("_stored", owner_path="CatalogueCharm").content["fingerprints"]
+
+    # WHEN the charm reconciles again
+    with patch.object(OpsContainer, "pull") as pull, patch.object(OpsContainer, "push") as push:
+        context.run(context.on.config_changed(), state)
+
+    # THEN nothing is pulled from or pushed to the container
+    pull.assert_not_called()
+    push.assert_not_called()
+
+
+def test_pebble_ready_invalidates_fingerprint_cache(
+    context, running_container, tmp_path, charm_layer, process_actions
+):
+    # GIVEN fingerprints from a previous reconcile
+    container = running_container(charm_layer(), NginxConfigBuilder().build())
+    state = context.run(context.on.config_changed(), State(leader=True, containers=[container]))
+
+    # AND a recreated container that lost the files pushed to it
+    (tmp_path / "web" / "config.json").unlink()
+
+    # WHEN pebble becomes ready
+    context.run(context.on.pebble_ready(container), state)
+
+    # THEN the files are pushed again
+    assert (tmp_path / "web" / "config.json").exists()
+
+
+def test_pebble_ready_refreshes_fqdn(context):
+    # GIVEN the FQDN of a previous pod in stored state
+    container = Container(name="catalogue", can_connect=True)
+    stored = StoredState(owner_path="CatalogueCharm", content={"fqdn": "old-pod.local"})
+    state = State(leader=True, containers=[container], stored_states=[stored])
+
+    # WHEN pebble becomes ready in a new pod
+    with patch("socket.getfqdn", return_value="new-pod.local"):
+        state = context.run(context.on.pebble_ready(container), state)
+
+    # THEN the FQDN is looked up again
+    stored = state.get_stored_state("_stored", owner_path="CatalogueCharm")
+    assert stored.content["fqdn"] == "new-pod.local"
+
+
+def test_checks_change_triggers_no_process_action(
+    context, running_container, charm_layer, process_actions
+):
+    # GIVEN a running catalogue whose checks are outdated
+    restart, send_signal = process_actions
+    outdated = charm_layer()
+    outdated.checks["catalogue-alive"].period = "1m"
+    container = running_container(outdated, NginxConfigBuilder().build())
+    state = State(leader=True, containers=[container])
+
+    # WHEN the charm reconciles
+    state = context.run(context.on.config_changed(), state)
+
+    # THEN the new checks are in the plan
+    plan = state.get_container("catalogue").plan
+    assert plan.checks["catalogue-alive"].period == "10s"
+    # AND nginx is neither restarted nor reloaded
+    restart.assert_not_called()
+    send_signal.assert_not_called()
+
+
+def test_status_reflects_failing_checks(context, running_container, charm_layer):
+    # GIVEN a running catalogue failing its readiness check
+    check = CheckInfo(
+        "catalogue-ready",
+        level=pebble.CheckLevel.READY,
+        startup=pebble.CheckStartup.UNSET,
+        status=pebble.CheckStatus.DOWN,
+    )
+    container = dataclasses.replace(
+        running_container(charm_layer(), NginxConfigBuilder().build()),
+        check_infos={check},
+    )
+    state = State(leader=True, containers=[container])
+
+    # WHEN Pebble reports the failure
+    state = context.run(context.on.pebble_check_failed(container, check), state)
+
+    # THEN the catalogue isn't reported active
+    assert state.unit_status == WaitingStatus("Failing checks: catalogue-ready")
+
+    # AND WHEN the check recovers
+    check = dataclasses.replace(check, status=pebble.CheckStatus.UP)
+    container = dataclasses.replace(state.get_container("catalogue"), check_infos={check})
+    state = dataclasses.replace(state, containers=[container])
+    state = context.run(context.on.pebble_check_recovered(container, check), state)
+
+    # THEN it is active again
+    assert state.unit_status == ActiveStatus()
@@ -0,0 +1,106 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the handling of TLS material by the charm."""
+
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from charms.tls_certificates_interface.v4.tls_certificates import TLSCertificatesRequiresV4
+from ops import pebble
+from ops.model import Container as OpsContainer
+from ops.testing import Container, State
+
+from charm import CatalogueCharm, TLSConfig
+from nginx_config import NGINX_CONFIG_PATH, NginxConfigBuilder
+
+
+def test_tls_material_parsed_once_per_dispatch(context):
+    state = State(leader=True, containers=[Container(name="catalogue", can_connect=True)])
+
+    with patch.object(
+        TLSCertificatesRequiresV4, "get_assigned_certificate", return_value=(None, None)
+    ) as get_assigned_certificate:
+        with context(context.on.update_status(), state) as manager:
+            charm = manager.charm
+            # WHEN every TLS consumer in the charm is accessed
+            _ = charm._tls_available, charm._internal_url, charm._internal_port, charm._tls_config
+            manager.run()
+
+    # THEN the certificate is only looked up once
+    get_assigned_certificate.assert_called_once()
+
+
+TLS_CONFIG = TLSConfig(server_cert="server-cert", ca_cert="ca-cert", private_key="private-key")
+
+
+@pytest.fixture
+def tls_available():
+    with patch.object(
+        CatalogueCharm, "_tls_config", new_callable=PropertyMock, return_value=TLS_CONFIG
+    ):
+        yield
+
+
+@pytest.fixture
+def running_container(catalogue_container):
+    """Return a factory of containers with `layer` running, serving TLS with `certs`."""
+
+    def container(layer: pebble.Layer, certs: dict) -> Container:
+        files = {f"/etc/catalogue/certs/{name}": content for name, content in certs.items()}
+        files[NGINX_CONFIG_PATH] = NginxConfigBuilder(tls=True).build()
+        return catalogue_container(layer=layer, files=files, dirs=["/web"])
+
+    return container
+
+
+def test_unchanged_certs_are_not_pushed(context, running_container, tls_available, charm_layer):
+    # GIVEN the current TLS material is already on disk
+    container = running_container(
+        charm_layer(TLS_CONFIG),
+        {
+            "catalogue.cert.pem": "server-cert",
+            "catalogue.key.pem": "private-key",
+            "ca.cert": "ca-cert",
+        },
+    )
+    state = State(leader=True, containers=[container])
+
+    # WHEN pebble becomes ready
+    with patch.object(OpsContainer, "push") as push, patch.object(
+        OpsContainer, "send_signal"
+    ) as send_signal:
+        context.run(context.on.pebble_ready(container), state)
+
+    # THEN no certificate file is pushed
+    pushed = [call.args[0] for call in push.call_args_list]
+    assert not any(path.startswith("/etc/catalogue/certs") for path in pushed)
+    # AND nginx is not reloaded
+    send_signal.assert_not_called()
+
+
+def test_rotated_cert_is_pushed_and_reloads_nginx(
+    context, running_container, tmp_path, tls_available, charm_layer
+):
+    # GIVEN an outdated server certificate on disk
+    container = running_container(
+        charm_layer(TLS_CONFIG),
+        {
+            "catalogue.cert.pem": "old-cert",
+            "catalogue.key.pem": "private-key",
+            "ca.cert": "ca-cert",
+        },
+    )
+    state = State(leader=True, containers=[container])
+
+    # WHEN pebble becomes ready
+    with patch.object(OpsContainer, "send_signal") as send_signal, patch.object(
+        OpsContainer, "restart"
+    ) as restart:
+        context.run(context.on.pebble_ready(container), state)
+
+    # THEN the new certificate is written
+    assert (tmp_path / "certs" / "catalogue.cert.pem").read_text() == "server-cert"
+    # AND nginx is reloaded to pick it up
+    send_signal.assert_called_once_with("SIGHUP", "catalogue")
+    restart.assert_not_called()
@@ -0,0 +1,115 @@
+# Copyright 2026 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Unit tests for the tracing and profiling of the reconcile phases."""
+
+from unittest.mock import patch
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from ops.model import Container as OpsContainer
+from ops.testing import Container, Relation, State
+
+import charm
+
+
+@pytest.fixture
+def exporter():
+    """Collect the spans of the charm, independently of the ops tracing backend."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    with patch.object(charm, "tracer", provider.get_tracer(charm.__name__)):
+        yield exporter
+
+
+def _spans(exporter) -> dict:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_reconcile_phases_are_traced(context, exporter):
+    # GIVEN a catalogue with an item to display
+    relation = Relation(
+        endpoint="catalogue",
+        remote_app_name="remote",
+        remote_app_data={"name": "remote", "url": "http://remote", "icon": "rainbow"},
+    )
+    container = Container(name="catalogue", can_connect=True)
+    state = State(leader=True, containers=[container], relations=[relation])
+
+    # WHEN pebble becomes ready
+    with patch.object(OpsContainer, "restart"):
+        context.run(context.on.pebble_ready(container), state)
+
+    # THEN each phase of the reconcile has its span
+    spans = _spans(exporter)
+    for phase in (
+        "update web server config",
+        "update catalogue config",
+        "update pebble layer",
+        "restart",
+        "check status",
+    ):
+        assert spans[phase].parent.span_id == spans["configure"].context.span_id
+    # AND the reconcile span tells what it did
+    configure = spans["configure"].attributes
+    assert configure["catalogue.items"] == 1
+    assert configure["catalogue.restarted"] is True
+    assert configure["catalogue.reloaded"] is False
+    assert configure["catalogue.pebble_calls"] > 0
+    # AND how much it pushed, phase by phase
+    pushed = spans["update catalogue config"].attributes["catalogue.bytes_pushed"]
+    assert pushed > 0
+    assert configure["catalogue.bytes_pushed"] >= pushed
+
+
+def test_idle_reconcile_pushes_nothing(context, exporter):
+    # GIVEN a catalogue reconciled once
+    container = Container(name="catalogue", can_connect=True)
+    with patch.object(OpsContainer, "restart"):
+        state = context.run(context.on.pebble_ready(container), State(containers=[container]))
+
+    # WHEN the charm reconciles again, with nothing changed since
+    exporter.clear()
+    context.run(context.on.config_changed(), state)
+
+    # THEN the reconcile pushes nothing, nor restarts anything
+    configure = _spans(exporter)["configure"].attributes
+    assert configure["catalogue.bytes_pushed"] == 0
+    assert configure["catalogue.restarted"] is False
+    assert "restart" not in _spans(exporter)
+
+
+@pytest.mark.parametrize("profiling", [False, True])
+def test_profiling(context, tmp_path, profiling):
+    # GIVEN profiling switched on or off
+    container = Container(name="catalogue", can_connect=True)
+    state = State(containers=[container], config={"profiling": profiling})
+
+    # WHEN the charm reconciles
+    with patch.object(charm, "PROFILES_DIR", tmp_path / "profiles"):
+        context.run(context.on.config_changed(), state)
+
+    # THEN a profile is dumped only if asked for
+    assert len(list(tmp_path.glob("profiles/configure-*.prof"))) == int(profiling)
+
+
+def test_old_profiles_are_removed(context, tmp_path):
+    # GIVEN as many profiles as are kept
+    profiles_dir = tmp_path / "profiles"
+    profiles_dir.mkdir()
+    for i in range(charm.MAX_PROFILES):
+        (profiles_dir / f"configure-{i:04}.prof").touch()
+    container = Container(name="catalogue", can_connect=True)
+    state = State(containers=[container], config={"profiling": True})
+
+    # WHEN the charm reconciles with profiling on
+    with patch.object(charm, "PROFILES_DIR", profiles_dir):
+        context.run(context.on.config_changed(), state)
+
+    # THEN the oldest profile makes way for the new one
+    profiles = sorted(path.name for path in profiles_dir.iterdir())
+    assert len(profiles) == charm.MAX_PROFILES
+    assert "configure-0000.prof" not in profiles
@@ -0,0 +1,22 @@
+// Write every Material Design Icon, under its name and its aliases, to the build
+// output. The catalogue then serves the icons of its items itself instead of
+// having them fetched from the public Iconify API, which air-gapped deployments
+// can't reach.
+import { copyFileSync, mkdirSync, readFileSync } from "node:fs";
+import { fileURLToPath } from "node:url";
+
+const mdiDir = fileURLToPath(new URL("../node_modules/@mdi/svg/", import.meta.url));
+const outDir = fileURLToPath(new URL("../dist/icons/mdi/", import.meta.url));
+
+mkdirSync(outDir, { recursive: true });
+
+const meta = JSON.parse(readFileSync(`${mdiDir}meta.json`, "utf8"));
+let count = 0;
+for (const { name, aliases = [] } of meta) {
+  for (const target of [name, ...aliases]) {
+    copyFileSync(`${mdiDir}svg/${name}.svg`, `${outDir}${target}.svg`);
+    count++;
+  }
+}
+
+console.log(`✓ ${count} MDI icons written to dist/icons/mdi`);
@@ -0,0 +1,42 @@
+// Check the gzipped size of what the browser loads up front against the budget in
+// package.json. The initial load is whatever dist/index.html references: the entry
+// chunk, its preloaded imports and the stylesheets. Lazily loaded chunks are listed,
+// but don't count towards the budget.
+import { readdirSync, readFileSync } from "node:fs";
+import { gzipSync } from "node:zlib";
+import { fileURLToPath } from "node:url";
+
+const uiDir = fileURLToPath(new URL("../", import.meta.url));
+const distDir = `${uiDir}dist/`;
+const { bundleBudget } = JSON.parse(readFileSync(`${uiDir}package.json`, "utf8"));
+
+const kB = (bytes) => `${(bytes / 1024).toFixed(1)} kB`;
+const gzipSize = (path) => gzipSync(readFileSync(`${distDir}${path}`), { level: 9 }).length;
+
+const index = readFileSync(`${distDir}index.html`, "utf8");
+const initial = new Set(
+  [...index.matchAll(/(?:src|href)="(?:\.\/|\/)?(assets\/[^"]+\.(?:js|css))"/g)].map((m) => m[1])
+);
+
+const totals = { js: 0, css: 0 };
+for (const path of initial) {
+  const size = gzipSize(path);
+  totals[path.endsWith(".css") ? "css" : "js"] += size;
+  console.log(`  initial  ${path.padEnd(48)} ${kB(size)}`);
+}
+for (const file of readdirSync(`${distDir}assets`)) {
+  const path = `assets/${file}`;
+  if (!initial.has(path) && file.endsWith(".js")) {
+    console.log(`  lazy     ${path.padEnd(48)} ${kB(gzipSize(path))}`);
+  }
+}
+
+let failed = false;
+for (const [kind, total] of Object.entries(totals)) {
+  const budget = bundleBudget[kind] * 1024;
+  const ok = total <= budget;
+  failed ||= !ok;
+  console.log(`${ok ? "✓" : "×"} initial ${kind}: ${kB(total)} (budget: ${kB(budget)}, gzipped)`);
+}
+
+process.exit(failed ? 1 : 0);
@@ -0,0 +1,32 @@
+// A Vite plugin building the service worker (src/sw.js) into dist/sw.js, with the list
+// of bundle files to precache. The worker is versioned after the content-hashed names of
+// those files, so every rock with a new UI bundle rolls out a new worker, while rebuilding
+// the same UI doesn't.
+import { createHash } from "node:crypto";
+import { readFileSync } from "node:fs";
+
+export function serviceWorker({ src }) {
+  return {
+    name: "catalogue-service-worker",
+    apply: "build",
+    // After the core plugins, so that the stylesheets are part of the bundle.
+    enforce: "post",
+    generateBundle(_options, bundle) {
+      const precache = Object.keys(bundle)
+        .filter((fileName) => fileName.startsWith("assets/"))
+        .sort();
+      const version = createHash("sha256")
+        .update(precache.join("\n"))
+        .digest("hex")
+        .slice(0, 12);
+
+      this.emitFile({
+        type: "asset",
+        fileName: "sw.js",
+        source: readFileSync(src, "utf8")
+          .replace("__SW_VERSION__", JSON.stringify(version))
+          .replace("__SW_PRECACHE__", JSON.stringify(precache)),
+      });
+    },
+  };
+}
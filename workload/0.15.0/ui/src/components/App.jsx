@@ -1,7 +1,13 @@
+import { lazy, Suspense } from "preact/compat";
 import { Navigation } from "./Navigation";
 import { HeroStrip } from "./HeroStrip";
 import { AppMatrix } from "./AppMatrix";
-import { LinksSection } from "./LinksSection";
+
+// Links sit below the fold, and many catalogues have none: they're loaded on demand, in
+// their own chunk. While it loads, pre-rendered links stay in place.
+const LinksSection = lazy(() =>
+  import("./LinksSection").then((m) => ({ default: m.LinksSection }))
+);
 
 export function App({ config }) {
   const { title, tagline, description, apps, links } = config;
@@ -17,7 +23,11 @@ export function App({ config }) {
           </div>
         </div>
         <AppMatrix apps={apps} />
-        <LinksSection links={links} />
+        {links && links.length > 0 && (
+          <Suspense fallback={null}>
+            <LinksSection links={links} />
+          </Suspense>
+        )}
       </div>
     </>
   );
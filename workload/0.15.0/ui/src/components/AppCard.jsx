@@ -1,10 +1,40 @@
-import { useState } from "preact/hooks";
-import { Icon } from "@iconify/react";
-import { EndpointsModal } from "./EndpointsModal";
+import { memo } from "preact/compat";
+import { MdiIcon } from "./MdiIcon";
 
-export function AppCard({ app, index }) {
+// Links are plain anchors, so that they also work in the page pre-rendered by the charm.
+function LinkButton({ url, icon, tooltip }) {
+  const content = (
+    <>
+      <MdiIcon icon={icon} class="iconify custom-icon" />
+      <span class="p-tooltip__message" role="tooltip">
+        {tooltip}
+      </span>
+    </>
+  );
+
+  if (!url) {
+    return (
+      <button class="p-tooltip--btm-center openLinkBtn customBtn" disabled>
+        {content}
+      </button>
+    );
+  }
+
+  return (
+    <a
+      class="p-button p-tooltip--btm-center openLinkBtn customBtn"
+      href={url}
+      target="_blank"
+      rel="noopener noreferrer"
+    >
+      {content}
+    </a>
+  );
+}
+
+// Cards only re-render when their app changes, not on every scroll or keystroke.
+export const AppCard = memo(function AppCard({ app, onShowEndpoints }) {
   const { name, icon, url, api_endpoints, api_docs, description } = app;
-  const [modalOpen, setModalOpen] = useState(false);
   const hasEndpoints =
     api_endpoints && Object.keys(api_endpoints).length > 0;
 
@@ -12,54 +42,27 @@ export function AppCard({ app, index }) {
     <li class="p-matrix__item">
       <div class="p-matrix__content">
         <h3 class="p-matrix__title">
-          <Icon icon={`mdi:${icon}`} class="iconify icon md-48" style={{ marginRight: '8px', fontSize: '1rem'}} />
+          <MdiIcon icon={icon} class="iconify icon md-48" style={{ marginRight: '8px', fontSize: '1rem'}} />
           {name}
         </h3>
         <div style={{ display: "flex" }}>
-          <button
-            class="p-tooltip--btm-center openLinkBtn customBtn"
-            disabled={!url}
-            onClick={() => url && window.open(url, "_blank")}
-          >
-            <Icon icon="mdi:web" class="iconify custom-icon" />
-            <span class="p-tooltip__message" role="tooltip">
-              Visit UI
-            </span>
-          </button>
+          <LinkButton url={url} icon="web" tooltip="Visit UI" />
 
           <button
             class="p-tooltip--btm-center customBtn"
             disabled={!hasEndpoints}
-            onClick={() => setModalOpen(true)}
+            onClick={() => onShowEndpoints(app)}
           >
-            <Icon icon="mdi:api" class="iconify custom-icon" />
+            <MdiIcon icon="api" class="iconify custom-icon" />
             <span class="p-tooltip__message" role="tooltip">
               View endpoints
             </span>
           </button>
 
-          {hasEndpoints && modalOpen && (
-            <EndpointsModal
-              name={name}
-              endpoints={api_endpoints}
-              index={index}
-              onClose={() => setModalOpen(false)}
-            />
-          )}
-
-          <button
-            class="p-tooltip--btm-center openLinkBtn customBtn"
-            disabled={!api_docs}
-            onClick={() => api_docs && window.open(api_docs, "_blank")}
-          >
-            <Icon icon="mdi:file-document" class="iconify custom-icon" />
-            <span class="p-tooltip__message" role="tooltip">
-              Read docs
-            </span>
-          </button>
+          <LinkButton url={api_docs} icon="file-document" tooltip="Read docs" />
         </div>
         {description && <p class="p-matrix__desc">{description}</p>}
       </div>
     </li>
   );
-}
+});
@@ -1,16 +1,67 @@
+import { useCallback, useEffect, useMemo, useRef, useState } from "preact/hooks";
+import { lazy, Suspense } from "preact/compat";
 import { AppCard } from "./AppCard";
+import { buildIndex, search } from "../search";
+import { useWindowedList } from "../hooks/useWindowedList";
+
+// The modal is seldom opened: it's split out of the main bundle and loaded on first use.
+const EndpointsModal = lazy(() =>
+  import("./EndpointsModal").then((m) => ({ default: m.EndpointsModal }))
+);
+
+// Smaller catalogues are rendered in full.
+const WINDOWED_FROM = 100;
+
+// Apps that didn't change across config updates keep their object (see liveConfig.js),
+// and therefore their key: their cards are neither re-created nor re-rendered.
+const appKeys = new WeakMap();
+let nextKey = 0;
+
+function keyOf(app) {
+  if (!appKeys.has(app)) appKeys.set(app, nextKey++);
+  return appKeys.get(app);
+}
 
 export function AppMatrix({ apps }) {
-  return (
-    <div class="row">
-      <div class="col-12">
-        {apps && apps.length > 0 ? (
-          <ul class="p-matrix" id="apps">
-            {apps.map((app, i) => (
-              <AppCard key={i} app={app} index={i} />
-            ))}
-          </ul>
-        ) : (
+  const [query, setQuery] = useState("");
+  const [openApp, setOpenApp] = useState(null);
+  const closeModal = useCallback(() => setOpenApp(null), []);
+  const listRef = useRef(null);
+  const indexRef = useRef({ apps: null, index: null });
+
+  function getIndex() {
+    if (indexRef.current.apps !== apps) {
+      indexRef.current = { apps, index: buildIndex(apps) };
+    }
+    return indexRef.current.index;
+  }
+
+  // Large catalogues get their search index built while the browser is idle, so that
+  // the first keystroke doesn't pay for it. The index is reused until the apps change.
+  useEffect(() => {
+    if (!apps || apps.length < WINDOWED_FROM) return;
+    const idle = window.requestIdleCallback || ((fn) => setTimeout(fn, 200));
+    const cancel = window.cancelIdleCallback || clearTimeout;
+    const handle = idle(() => getIndex());
+    return () => cancel(handle);
+  }, [apps]);
+
+  const matches = useMemo(
+    () => (apps && query.trim() ? search(getIndex(), query) : null),
+    [apps, query]
+  );
+
+  const count = matches ? matches.length : apps ? apps.length : 0;
+  const { start, end, paddingTop, paddingBottom } = useWindowedList(
+    listRef,
+    count,
+    count >= WINDOWED_FROM
+  );
+
+  if (!apps || apps.length === 0) {
+    return (
+      <div class="row">
+        <div class="col-12">
           <div class="p-notification--caution">
             <div class="p-notification__content">
               <h5 class="p-notification__title">No items to display</h5>
@@ -20,6 +71,45 @@ export function AppMatrix({ apps }) {
               </p>
             </div>
           </div>
+        </div>
+      </div>
+    );
+  }
+
+  const cards = [];
+  for (let i = start; i < end; i++) {
+    const app = apps[matches ? matches[i] : i];
+    cards.push(<AppCard key={keyOf(app)} app={app} onShowEndpoints={setOpenApp} />);
+  }
+
+  return (
+    <div class="row">
+      <div class="col-12">
+        <input
+          type="search"
+          class="app-search"
+          aria-label="Search applications"
+          placeholder="Search applications"
+          autocomplete="off"
+          value={query}
+          onInput={(e) => setQuery(e.currentTarget.value)}
+        />
+        {count > 0 ? (
+          <ul class="p-matrix" id="apps" ref={listRef} style={{ paddingTop, paddingBottom }}>
+            {cards}
+          </ul>
+        ) : (
+          <p>No applications match your search.</p>
+        )}
+        {openApp && openApp.api_endpoints && (
+          <Suspense fallback={null}>
+            <EndpointsModal
+              name={openApp.name}
+              endpoints={openApp.api_endpoints}
+              index={keyOf(openApp)}
+              onClose={closeModal}
+            />
+          </Suspense>
         )}
       </div>
     </div>
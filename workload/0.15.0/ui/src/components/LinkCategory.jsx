@@ -1,4 +1,4 @@
-import { Icon } from "@iconify/react";
+import { MdiIcon } from "./MdiIcon";
 
 export function LinkCategory({ link }) {
   const { category, items } = link;
@@ -9,7 +9,7 @@ export function LinkCategory({ link }) {
     <li class="p-matrix__item">
       <div class="p-matrix__content">
         <h3 class="p-matrix__title">
-          <Icon icon="mdi:bookmark" class="iconify icon md-48" style={{ marginRight: '8px', fontSize: '1rem'}} />
+          <MdiIcon icon="bookmark" class="iconify icon md-48" style={{ marginRight: '8px', fontSize: '1rem'}} />
           
           {category}
         </h3>
@@ -0,0 +1,46 @@
+import { useEffect, useState } from "preact/hooks";
+
+// Icons are served by the catalogue itself, one SVG per MDI icon name (see
+// scripts/build-icons.js), so rendering them never needs an external request.
+const ICON_NAME = /^[a-z0-9]+(-[a-z0-9]+)*$/;
+const loaded = new Map();
+const pending = new Map();
+
+function loadIcon(name) {
+  if (!pending.has(name)) {
+    const request = ICON_NAME.test(name)
+      ? fetch(`icons/mdi/${name}.svg`)
+          .then((res) => (res.ok ? res.text() : ""))
+          .catch(() => "")
+      : Promise.resolve("");
+    pending.set(
+      name,
+      request.then((svg) => {
+        loaded.set(name, svg);
+        return svg;
+      })
+    );
+  }
+  return pending.get(name);
+}
+
+export function MdiIcon({ icon, class: className, style }) {
+  const [svg, setSvg] = useState(() => loaded.get(icon) || "");
+
+  useEffect(() => {
+    let active = true;
+    loadIcon(icon).then((markup) => active && setSvg(markup));
+    return () => {
+      active = false;
+    };
+  }, [icon]);
+
+  return (
+    <span
+      class={className}
+      style={style}
+      aria-hidden="true"
+      dangerouslySetInnerHTML={{ __html: svg }}
+    />
+  );
+}
@@ -0,0 +1,80 @@
+import { useEffect, useLayoutEffect, useState } from "preact/hooks";
+
+// Extra height rendered above and below the viewport, so that scrolling doesn't
+// reveal blank rows before the next frame.
+const OVERSCAN_PX = 800;
+// Items rendered before the layout could be measured.
+const INITIAL_COUNT = 48;
+
+// Window a long list laid out in rows of equally wide items, like a p-matrix.
+// Only the items around the viewport are rendered; the rows above and below
+// them are replaced by padding of the same (estimated) height.
+export function useWindowedList(listRef, count, enabled) {
+  const [layout, setLayout] = useState({ columns: 1, rowHeight: 0 });
+  const [range, setRange] = useState({ start: 0, end: INITIAL_COUNT });
+
+  // Measure the columns and the average row height from the rendered items.
+  useLayoutEffect(() => {
+    const items = listRef.current && listRef.current.children;
+    if (!enabled || !items || items.length === 0) return;
+
+    const top = items[0].offsetTop;
+    let columns = 1;
+    while (columns < items.length && items[columns].offsetTop === top) columns++;
+    const last = items[items.length - 1];
+    const rowHeight = (last.offsetTop + last.offsetHeight - top) / Math.ceil(items.length / columns);
+
+    if (columns !== layout.columns || Math.abs(rowHeight - layout.rowHeight) > 1) {
+      setLayout({ columns, rowHeight });
+    }
+  });
+
+  useEffect(() => {
+    if (!enabled) return;
+
+    let frame = 0;
+    function update() {
+      frame = 0;
+      const list = listRef.current;
+      const { columns, rowHeight } = layout;
+      if (!list || !rowHeight) return;
+
+      const top = list.getBoundingClientRect().top;
+      const firstRow = Math.max(0, Math.floor((-top - OVERSCAN_PX) / rowHeight));
+      const lastRow = Math.ceil((window.innerHeight - top + OVERSCAN_PX) / rowHeight);
+      const start = Math.min(count, firstRow * columns);
+      const end = Math.min(count, Math.max(start, lastRow * columns));
+      setRange((prev) => (prev.start === start && prev.end === end ? prev : { start, end }));
+    }
+    function schedule() {
+      if (!frame) frame = requestAnimationFrame(update);
+    }
+
+    update();
+    window.addEventListener("scroll", schedule, { passive: true });
+    window.addEventListener("resize", schedule);
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener("scroll", schedule);
+      window.removeEventListener("resize", schedule);
+    };
+  }, [enabled, count, layout]);
+
+  if (!enabled) {
+    return { start: 0, end: count, paddingTop: 0, paddingBottom: 0 };
+  }
+
+  const { columns, rowHeight } = layout;
+  if (!rowHeight) {
+    return { start: 0, end: Math.min(count, INITIAL_COUNT), paddingTop: 0, paddingBottom: 0 };
+  }
+
+  const start = Math.min(range.start, count);
+  const end = Math.min(range.end, count);
+  return {
+    start,
+    end,
+    paddingTop: Math.floor(start / columns) * rowHeight,
+    paddingBottom: Math.max(0, Math.ceil(count / columns) - Math.ceil(end / columns)) * rowHeight,
+  };
+}
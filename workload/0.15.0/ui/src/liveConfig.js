@@ -0,0 +1,103 @@
+// Keep the catalogue config up to date without reloading the page.
+//
+// config.json is revalidated with conditional requests, so an unchanged catalogue
+// only costs a 304 response. The delay between checks backs off for as long as
+// nothing changes, and no checks are made while the page is hidden.
+//
+// The first load may be answered by the service worker from its cache (see sw.js), so
+// the catalogue shows up at once even while the pod restarts. The checks that follow
+// always go to the server.
+
+const MIN_DELAY_MS = 15 * 1000;
+const MAX_DELAY_MS = 5 * 60 * 1000;
+
+// Reuse the objects of the current apps that didn't change, so that only the
+// cards of new or updated apps re-render.
+function mergeApps(current, next) {
+  const byContent = new Map();
+  for (const app of current) {
+    const content = JSON.stringify(app);
+    byContent.set(content, [...(byContent.get(content) || []), app]);
+  }
+  let changed = current.length !== next.length;
+  const apps = next.map((app, i) => {
+    const same = (byContent.get(JSON.stringify(app)) || []).shift();
+    if (same !== current[i]) changed = true;
+    return same || app;
+  });
+  return changed ? apps : current;
+}
+
+export function mergeConfig(current, next) {
+  if (!current) return next;
+
+  const apps = mergeApps(current.apps || [], next.apps || []);
+  const { apps: _currentApps, ...currentRest } = current;
+  const { apps: _nextApps, ...nextRest } = next;
+  if (apps === current.apps && JSON.stringify(currentRest) === JSON.stringify(nextRest)) {
+    return current;
+  }
+  return { ...next, apps };
+}
+
+// Call `onChange` with the catalogue config, then again whenever it changes.
+// Return a function that stops watching.
+export function watchConfig(onChange, initial = null) {
+  let current = initial;
+  let etag = null;
+  let delay = MIN_DELAY_MS;
+  let timer = null;
+  let stopped = false;
+
+  function schedule() {
+    if (!stopped && !timer && !document.hidden) {
+      timer = setTimeout(check, delay);
+    }
+  }
+
+  async function check() {
+    timer = null;
+    let changed = false;
+    try {
+      // "no-store" keeps the browser cache and the service worker cache out of the
+      // way: the request is revalidated against the server with our own ETag.
+      const res = await fetch(
+        "config.json",
+        current
+          ? { cache: "no-store", headers: etag ? { "If-None-Match": etag } : {} }
+          : {}
+      );
+      if (res.ok) {
+        etag = res.headers.get("ETag");
+        const next = mergeConfig(current, await res.json());
+        if (next !== current) {
+          current = next;
+          changed = true;
+          onChange(next);
+        }
+      }
+    } catch (e) {
+      // Keep showing the current config, and try again later.
+    }
+    delay = changed ? MIN_DELAY_MS : Math.min(delay * 2, MAX_DELAY_MS);
+    schedule();
+  }
+
+  function onVisibilityChange() {
+    clearTimeout(timer);
+    timer = null;
+    if (!document.hidden) {
+      delay = MIN_DELAY_MS;
+      check();
+    }
+  }
+
+  document.addEventListener("visibilitychange", onVisibilityChange);
+  check();
+
+  return () => {
+    stopped = true;
+    clearTimeout(timer);
+    document.removeEventListener("visibilitychange", onVisibilityChange);
+  };
+}
@@ -1,21 +1,35 @@
 import "./styles/vanilla.scss";
 import "./styles/ui.css";
-import { render } from "preact";
+import { hydrate, render } from "preact";
 import { useState, useEffect } from "preact/hooks";
 import { App } from "./components/App";
+import { watchConfig } from "./liveConfig";
+
+// The charm pre-renders the catalogue into index.html, inlining the config it rendered.
+const inlined = document.getElementById("catalogue-config");
+const initialConfig = inlined ? JSON.parse(inlined.textContent) : null;
 
 function Root() {
-  const [config, setConfig] = useState(null);
+  const [config, setConfig] = useState(initialConfig);
 
-  useEffect(() => {
-    fetch("config.json")
-      .then((res) => res.json())
-      .then(setConfig);
-  }, []);
+  useEffect(() => watchConfig(setConfig, initialConfig), []);
 
   if (!config) return null;
 
   return <App config={config} />;
 }
 
-render(<Root />, document.getElementById("root"));
+const root = document.getElementById("root");
+if (initialConfig) {
+  hydrate(<Root />, root);
+} else {
+  render(<Root />, root);
+}
+
+// The service worker keeps the UI up across catalogue restarts (see sw.js). It's only
+// built for production.
+if (import.meta.env.PROD && "serviceWorker" in navigator) {
+  window.addEventListener("load", () => {
+    navigator.serviceWorker.register("./sw.js").catch(() => {});
+  });
+}
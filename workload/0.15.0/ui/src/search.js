@@ -0,0 +1,68 @@
+// Client-side search over the names and descriptions of the catalogue items.
+//
+// A trigram index is built once per catalogue, so a keystroke only intersects a
+// few posting lists and checks the remaining candidates, instead of rescanning
+// every item.
+
+function normalize(text) {
+  return (text || "").toLowerCase();
+}
+
+function trigrams(text) {
+  const grams = new Set();
+  for (let i = 0; i + 3 <= text.length; i++) {
+    grams.add(text.slice(i, i + 3));
+  }
+  return grams;
+}
+
+// Both lists hold item ids in ascending order.
+function intersect(a, b) {
+  const out = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      out.push(a[i]);
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return out;
+}
+
+export function buildIndex(apps) {
+  const docs = apps.map((app) => normalize(`${app.name}\n${app.description}`));
+  const postings = new Map();
+  docs.forEach((doc, id) => {
+    for (const gram of trigrams(doc)) {
+      let ids = postings.get(gram);
+      if (!ids) {
+        ids = [];
+        postings.set(gram, ids);
+      }
+      ids.push(id);
+    }
+  });
+  return { docs, postings };
+}
+
+// Return the ids of the items matching every word of the query, in catalogue order.
+export function search(index, query) {
+  const terms = normalize(query).split(/\s+/).filter(Boolean);
+  let candidates = null;
+  for (const term of terms) {
+    if (term.length < 3) continue;
+    for (const gram of trigrams(term)) {
+      const ids = index.postings.get(gram) || [];
+      candidates = candidates ? intersect(candidates, ids) : ids;
+      if (candidates.length === 0) return [];
+    }
+  }
+  const ids = candidates || index.docs.map((_, id) => id);
+  return ids.filter((id) => terms.every((term) => index.docs[id].includes(term)));
+}
@@ -0,0 +1,88 @@
+// The catalogue's service worker, keeping the UI up while the catalogue pod restarts.
+//
+// - The hashed bundle never changes under its name: it's precached, and served from
+//   the cache first.
+// - index.html is pre-rendered by the charm: it's fetched from the network first, and
+//   served from the cache when the catalogue is unreachable.
+// - config.json is served stale-while-revalidate. The UI polls it with "no-store"
+//   requests (see liveConfig.js), which always go to the network, and refresh the cache.
+//
+// The build (scripts/service-worker.js) fills in the bundle and its version: each new
+// bundle installs as a new worker. It only activates once no tab runs the previous one,
+// as those may still load their lazy chunks from its cache, which it then drops.
+
+const VERSION = __SW_VERSION__;
+const PRECACHE = __SW_PRECACHE__;
+const CACHE = `catalogue-${VERSION}`;
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches
+      .open(CACHE)
+      .then((cache) => cache.addAll(PRECACHE))
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((keys) =>
+        Promise.all(
+          keys
+            .filter((key) => key.startsWith("catalogue-") && key !== CACHE)
+            .map((key) => caches.delete(key))
+        )
+      )
+  );
+});
+
+async function fetchAndCache(request) {
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(CACHE);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function cacheFirst(request) {
+  return (await caches.match(request)) || fetchAndCache(request);
+}
+
+async function networkFirst(request) {
+  try {
+    return await fetchAndCache(request);
+  } catch (e) {
+    const cached = await caches.match(request);
+    if (cached) return cached;
+    throw e;
+  }
+}
+
+async function staleWhileRevalidate(event) {
+  const cached = await caches.match(event.request);
+  const refresh = fetchAndCache(event.request);
+  if (!cached) return refresh;
+  event.waitUntil(refresh.catch(() => {}));
+  return cached;
+}
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  if (request.method !== "GET") return;
+
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+  const path = url.pathname.slice(new URL(self.registration.scope).pathname.length);
+
+  if (path === "config.json") {
+    event.respondWith(
+      request.cache === "no-store" ? fetchAndCache(request) : staleWhileRevalidate(event)
+    );
+  } else if (request.mode === "navigate") {
+    event.respondWith(networkFirst(request));
+  } else if (path.startsWith("assets/") || path.startsWith("icons/")) {
+    event.respondWith(cacheFirst(request));
+  }
+});
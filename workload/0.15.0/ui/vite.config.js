@@ -1,10 +1,31 @@
 import { defineConfig } from "vite";
 import preact from "@preact/preset-vite";
+import purgeCSSPlugin from "@fullhuman/postcss-purgecss";
+import { serviceWorker } from "./scripts/service-worker.js";
 
-export default defineConfig({
+export default defineConfig(({ command }) => ({
   base: "./",
-  plugins: [preact()],
+  plugins: [preact(), serviceWorker({ src: "src/sw.js" })],
   css: {
+    postcss: {
+      // The dev server keeps every rule, so that classes added while editing just work.
+      plugins:
+        command === "build"
+          ? [
+              purgeCSSPlugin({
+                content: [
+                  "index.html",
+                  "src/**/*.{js,jsx}",
+                  // The charm pre-renders the catalogue with the markup of the components.
+                  // The rock only builds from ui/, where the components carry its classes.
+                  "../../../charm/src/prerender.py",
+                ],
+                // Vanilla's state modifiers, which its patterns switch on at runtime.
+                safelist: { standard: [/^is-/] },
+              }),
+            ]
+          : [],
+    },
     preprocessorOptions: {
       scss: {
         includePaths: ["node_modules"],
@@ -17,4 +38,4 @@ export default defineConfig({
       },
     },
   },
-});
+}));